@@ -0,0 +1,54 @@
+"""
+Backtester benchmark: parameter sweeps over a synthetic universe, offline.
+
+Builds a CompactPanel straight from FakeMarket histories (no cache, no
+network), then times the dense-array build and a criteria x N x frequency x
+cost sweep.
+
+    python -m benchmarks.bench_backtest --symbols 1000 --years 10
+"""
+import argparse
+import time
+
+from benchmarks.fake_market import FakeMarket, synthetic_symbols
+from stock_div.backtest import Backtester
+from stock_div.compact_panel import CompactPanel
+from stock_div.ranking import DEFAULT_CRITERIA
+
+CRITERIA = dict(
+    DEFAULT_CRITERIA,
+    blend={"avg_5y": 0.7, "avg_10y": 0.3},
+    dip={"avg_5y": 1.0, "drawdown_1y": -0.05},
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=1_000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--top", type=int, nargs="+", default=[10, 20, 50])
+    parser.add_argument("--freq", nargs="+", default=["M", "Q"])
+    parser.add_argument("--cost-bps", type=float, nargs="+", default=[0.0, 10.0])
+    args = parser.parse_args(argv)
+
+    market = FakeMarket(years=args.years)
+    start = time.perf_counter()
+    panel = CompactPanel.from_histories({symbol: market.frame(symbol) for symbol in synthetic_symbols(args.symbols)})
+    print(f"{'synthetic panel':<24} {time.perf_counter() - start:>8.2f} s  ({len(panel)} symbols, {args.years}y)")
+
+    start = time.perf_counter()
+    backtester = Backtester(panel)
+    print(f"{'dense arrays':<24} {time.perf_counter() - start:>8.2f} s")
+
+    for label in ("sweep (cold metrics)", "sweep (warm metrics)"):
+        start = time.perf_counter()
+        table = backtester.sweep(CRITERIA, args.top, args.freq, args.cost_bps)
+        seconds = time.perf_counter() - start
+        print(f"{label:<24} {seconds:>8.2f} s  ({len(table)} combinations, {seconds / len(table) * 1000:.1f} ms each)")
+
+    best = table.sort_values("sharpe", ascending=False).head(5)
+    print(best[["strategy", "n", "freq", "cost_bps", "cagr_%", "benchmark_cagr_%", "sharpe", "max_drawdown_%"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
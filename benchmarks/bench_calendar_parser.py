@@ -0,0 +1,59 @@
+"""
+Dividend-calendar parser benchmark: lxml engine vs the BeautifulSoup baseline.
+
+Parses large calendar responses with every available engine, checks that
+they return identical rows and reports the time per engine.
+
+    python -m benchmarks.bench_calendar_parser --rows 1000 10000 50000
+    python -m benchmarks.bench_calendar_parser --response saved_response.json
+"""
+import argparse
+import json
+import time
+
+from benchmarks.fake_market import synthetic_calendar_html
+from stock_div.calendar_parser import ENGINES
+
+
+def time_engine(parse, html, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows, _ = parse(html)
+        best = min(best, time.perf_counter() - start)
+    return best, rows
+
+
+def bench(label, html, repeat):
+    timings = {}
+    baseline_rows = None
+    for name, parse in ENGINES.items():
+        seconds, rows = time_engine(parse, html, repeat)
+        timings[name] = seconds
+        if baseline_rows is None:
+            baseline_rows = rows
+        elif rows != baseline_rows:
+            raise AssertionError(f"{name} rows differ from {next(iter(ENGINES))} on {label}")
+    line = " ".join(f"{name}={seconds * 1000:>9.1f} ms" for name, seconds in timings.items())
+    speedup = ""
+    if "lxml" in timings and timings["lxml"] > 0:
+        speedup = f" speedup x{timings['bs4'] / timings['lxml']:.1f}"
+    print(f"{label:<24} {len(baseline_rows):>7} rows  {line}{speedup}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--response", nargs="*", default=[], help="saved calendar JSON responses to parse as well")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs per engine")
+    args = parser.parse_args(argv)
+
+    for rows in args.rows:
+        bench("synthetic", synthetic_calendar_html(rows), args.repeat)
+    for path in args.response:
+        with open(path, encoding="utf-8") as f:
+            bench(path, json.load(f)["data"], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+End-to-end offline benchmarks for the three pipelines.
+
+Runs the kompas100 analysis, fetch_and_save_stock_info and
+save_annual_dividend_history against FakeMarket at several universe sizes and
+reports wall time and peak traced memory per stage.
+
+    python -m benchmarks.bench_pipeline --sizes 100 1000 10000 --json bench.json
+
+Everything runs inside a temporary working directory, so ./data, the price
+cache and the reports never touch the repository.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from benchmarks.fake_market import FakeMarket, synthetic_symbols
+from stock_div.backend import use_backend
+from stock_div.compact_panel import memory_report
+from stock_div.dividend_history import save_annual_dividend_history
+from stock_div.dividend_yield import avg_annual_yields, dividends_from_panel, latest_prices_from_panel
+from stock_div.drawdown import WINDOWS, drawdown_pct, period_highs
+from stock_div.fetch_executor import FetchExecutor
+from stock_div.kompas import analyze_universe, top_lists, write_report
+from stock_div.price_cache import fetch_universe
+from stock_div.stock_info import fetch_and_save_stock_info
+
+SIZES = (100, 1_000, 10_000)
+
+
+class StageTimer:
+    """Times stages and records peak traced memory for each one."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.records = []
+
+    @contextlib.contextmanager
+    def stage(self, pipeline, size, name, market=None):
+        requests_before = sum(market.requests.values()) if market else 0
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            # Pipelines print per-symbol progress; keep the benchmark output readable
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak_mb = None
+            if self.trace_memory:
+                peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            record = {
+                "pipeline": pipeline, "size": size, "stage": name,
+                "seconds": round(seconds, 4),
+                "peak_mb": None if peak_mb is None else round(peak_mb, 1),
+                "requests": (sum(market.requests.values()) - requests_before) if market else None,
+            }
+            self.records.append(record)
+            memory = "" if peak_mb is None else f"{peak_mb:>9.1f} MB"
+            requests = "" if record["requests"] is None else f"{record['requests']:>6} req"
+            print(f"{pipeline:<16} {size:>7} {name:<28} {seconds:>9.3f}s {memory} {requests}")
+
+
+def bench_kompas100(timer, market, executor, size):
+    symbols = synthetic_symbols(size)
+    universe = {symbol.split(".")[0]: symbol for symbol in symbols}
+    as_of = datetime.now()
+
+    with timer.stage("kompas100", size, "fetch_universe (cold)", market):
+        fetch_universe(symbols, executor=executor)
+    with timer.stage("kompas100", size, "fetch_universe (warm)", market):
+        panel = fetch_universe(symbols, executor=executor)
+    with timer.stage("kompas100", size, "fetch_universe (warm, compact)", market):
+        compact = fetch_universe(symbols, executor=executor, compact=True)
+    print(memory_report(panel, compact).to_string())
+    del compact
+    with timer.stage("kompas100", size, "fetch_universe (stale)", market):
+        fetch_universe(symbols, executor=executor, max_age=timedelta(0))
+    with timer.stage("kompas100", size, "dividend yields"):
+        latest_prices = latest_prices_from_panel(panel)
+        avg_annual_yields(dividends_from_panel(panel), latest_prices, (2, 5, 10), as_of)
+    with timer.stage("kompas100", size, "drawdowns"):
+        drawdown_pct(latest_prices, period_highs(panel["High"], WINDOWS, as_of))
+    del panel
+    with timer.stage("kompas100", size, "analyze_universe (warm)", market):
+        df_results = analyze_universe(universe, as_of, executor=executor)
+    with timer.stage("kompas100", size, "top_lists"):
+        tables = top_lists(df_results, 20)
+    with timer.stage("kompas100", size, "write_report"):
+        write_report(as_of, *tables)
+
+
+def bench_stock_info(timer, market, executor, size):
+    with timer.stage("stock_info", size, "fetch_and_save_stock_info", market):
+        fetch_and_save_stock_info(synthetic_symbols(size), "bench", executor=executor)
+
+
+def bench_dividend_history(timer, market, size):
+    with timer.stage("dividend_history", size, "save_annual_dividend_history", market):
+        for symbol in synthetic_symbols(size):
+            save_annual_dividend_history(symbol)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of fake network latency per request")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--fixtures", help="folder of recorded responses from benchmarks.fake_market record")
+    parser.add_argument("--pipelines", nargs="+", default=["kompas100", "stock_info", "dividend_history"])
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows allocation-heavy stages")
+    parser.add_argument("--json", help="write all stage records to this file")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.json) if args.json else None
+    timer = StageTimer(trace_memory=not args.no_memory)
+    cwd = os.getcwd()
+
+    for size in args.sizes:
+        market = FakeMarket(latency=args.latency, fixture_dir=args.fixtures and os.path.abspath(args.fixtures))
+        # Unthrottled: the benchmark measures our code, not the production rate limit
+        executor = FetchExecutor(max_workers=args.workers, rate=1e9, burst=10**9, retries=0)
+        with tempfile.TemporaryDirectory(prefix="stock-div-bench-") as workdir, use_backend(market):
+            os.chdir(workdir)
+            try:
+                if "kompas100" in args.pipelines:
+                    bench_kompas100(timer, market, executor, size)
+                if "stock_info" in args.pipelines:
+                    bench_stock_info(timer, market, executor, size)
+                if "dividend_history" in args.pipelines:
+                    bench_dividend_history(timer, market, size)
+            finally:
+                os.chdir(cwd)
+                executor.shutdown()
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"run_at": datetime.now().isoformat(), "python": sys.version, "records": timer.records}, f, indent=2)
+        print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Correctness checks for the error-prone numerics, offline.
+
+Each check builds data with a known answer and asserts that the pipeline
+recovers it; the run stops at the first mismatch.
+
+    python -m benchmarks.check_numerics
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fake_market import FakeMarket, synthetic_symbols
+from stock_div.backtest import Backtester
+from stock_div.compact_panel import CompactPanel
+from stock_div.corporate_actions import split_adjusted_dividends
+from stock_div.dividend_yield import payout_yields
+
+SPLIT_DAY = pd.Timestamp("2022-01-03")
+
+
+def _raw_histories(n_symbols, years):
+    """FakeMarket histories taken as raw (unadjusted) prices, without splits."""
+    market = FakeMarket(years=years)
+    return {symbol: market.frame(symbol).assign(**{"Stock Splits": 0.0}) for symbol in synthetic_symbols(n_symbols)}
+
+
+def _yahoo_adjusted(history):
+    """
+    Dividend-adjusted copy of a raw history, the way Yahoo builds it: every bar
+    before an ex-date is scaled by 1 - D / (raw close the day before).
+    """
+    close = history["Close"].to_numpy(dtype=float)
+    paid = history["Dividends"].to_numpy(dtype=float)
+    factor = np.ones(len(close))
+    ex = np.flatnonzero(paid[1:] > 0) + 1
+    factor[ex - 1] = 1 - paid[ex] / close[ex - 1]
+    multiplier = np.cumprod(factor[::-1])[::-1]
+    return history.assign(Close=close * multiplier, High=history["High"].to_numpy(dtype=float) * multiplier)
+
+
+def _raw_payout_yields(histories):
+    """Per (Symbol, Date): the payout over the raw close the day before, in percent."""
+    frames = []
+    for symbol, history in histories.items():
+        previous = history["Close"].shift(1)
+        paid = history["Dividends"] > 0
+        frames.append(pd.DataFrame({"Symbol": symbol, "Date": history.index[paid],
+                                    "expected": (history["Dividends"] / previous * 100)[paid].to_numpy()}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def check_payout_yields(n_symbols=200, years=10):
+    histories = _raw_histories(n_symbols, years)
+    panel = CompactPanel.from_histories({symbol: _yahoo_adjusted(h) for symbol, h in histories.items()})
+    dividends = panel.dividends_with_prices()
+    got = dividends.assign(got=payout_yields(dividends).to_numpy())
+    both = got.merge(_raw_payout_yields(histories), on=["Symbol", "Date"], validate="one_to_one")
+    assert len(both) == len(dividends), "payouts lost between the panel and the raw histories"
+    # float32 panel closes: compare relatively
+    error = np.nanmax(np.abs(both["got"] / both["expected"] - 1))
+    assert np.array_equal(np.isnan(both["got"]), np.isnan(both["expected"])), "NaN yields differ"
+    assert error < 1e-5, f"payout yields off by up to {error:.2e}"
+    return f"{len(both)} payouts, max relative error {error:.1e}"
+
+
+def check_backtest_raw_prices(n_symbols=200, years=10):
+    histories = _raw_histories(n_symbols, years)
+    adjusted = Backtester(CompactPanel.from_histories({symbol: _yahoo_adjusted(h) for symbol, h in histories.items()}))
+    raw = Backtester(CompactPanel.from_histories(histories), adjusted=False)
+    both = np.isfinite(raw.price)
+    assert np.array_equal(both, np.isfinite(adjusted.price)), "raw and recovered prices cover different bars"
+    error = np.max(np.abs(adjusted.price[both] / raw.price[both] - 1))
+    assert error < 1e-5, f"recovered raw prices off by up to {error:.2e}"
+    return f"{int(both.sum())} bars, max relative error {error:.1e}"
+
+
+def check_backtest_without_rebalances():
+    market = FakeMarket(years=1)
+    backtester = Backtester(CompactPanel.from_histories({symbol: market.frame(symbol) for symbol in synthetic_symbols(20)}))
+    for call in (lambda: backtester.run({"avg_5y": 1.0}), lambda: backtester.sweep({"5y": {"avg_5y": 1.0}})):
+        try:
+            call()
+        except ValueError as e:
+            assert "no rebalance dates" in str(e), f"unexpected error: {e}"
+        else:
+            raise AssertionError("a backtest shorter than the warmup did not raise")
+    try:
+        Backtester(CompactPanel.from_histories({}))
+    except ValueError as e:
+        assert "no symbols" in str(e), f"unexpected error: {e}"
+    else:
+        raise AssertionError("a backtest without symbols did not raise")
+    return "run, sweep and an empty panel raise ValueError"
+
+
+def _quarterly(symbol, amount, years=(2019, 2020, 2021, 2022, 2023, 2024), close=100.0):
+    """One payout of `amount` a quarter, all at the same prior close."""
+    dates = [pd.Timestamp(year, month, 15) for year in years for month in (3, 6, 9, 12)]
+    return pd.DataFrame({"Symbol": symbol, "Date": dates, "Dividends": amount, "Close": close})
+
+
+def _split_cases():
+    """
+    (dividends, splits, expected restated dividends) for one 5:1 split per symbol.
+
+    A pays 1.0 a quarter per current share on a close of 100; B-F vary how Yahoo
+    reported the pre-split payouts.
+    """
+    frames, expected = [], []
+
+    def add(frame, restated):
+        frames.append(frame)
+        expected.append(restated)
+
+    def pre(frame):
+        return frame["Date"] < SPLIT_DAY
+
+    # A: pre-split payouts reported in pre-split shares (x5): all of them restated
+    a = _quarterly("A", 1.0)
+    add(a.assign(Dividends=np.where(pre(a), 5.0, 1.0)), a["Dividends"])
+    # B: already adjusted: left alone
+    b = _quarterly("B", 1.0)
+    add(b, b["Dividends"])
+    # C: adjusted, plus a pre-split special of 2.5 (yield 2.5%): the special must not shrink
+    c = pd.concat([_quarterly("C", 1.0), pd.DataFrame({"Symbol": ["C"], "Date": [pd.Timestamp("2020-11-02")],
+                                                         "Dividends": [2.5], "Close": [100.0]})], ignore_index=True)
+    add(c, c["Dividends"])
+    # D: adjusted, plus a pre-split special of exactly 5x the regular payout: still not restated,
+    # because the regular payouts of its year disagree
+    d = pd.concat([_quarterly("D", 1.0), pd.DataFrame({"Symbol": ["D"], "Date": [pd.Timestamp("2021-11-02")],
+                                                         "Dividends": [5.0], "Close": [100.0]})], ignore_index=True)
+    add(d, d["Dividends"])
+    # E: no payouts after the split, pre-split yield 30% unadjusted: restated by the threshold
+    e = _quarterly("E", 30.0, years=(2019, 2020, 2021))
+    add(e, e["Dividends"] / 5)
+    # F: unadjusted payouts whose price drifted +-20%: still restated
+    f = _quarterly("F", 1.0)
+    drift = np.where(pre(f), np.linspace(0.8, 1.2, len(f)), 1.0)
+    add(f.assign(Dividends=np.where(pre(f), 5.0, 1.0) * drift), f["Dividends"] * drift)
+
+    dividends = pd.concat(frames, ignore_index=True)
+    splits = pd.DataFrame({"Symbol": list("ABCDEF"), "Date": SPLIT_DAY, "Ratio": 5.0})
+    return dividends, splits, pd.concat(expected, ignore_index=True).to_numpy(dtype=float)
+
+
+def check_split_restatement():
+    dividends, splits, expected = _split_cases()
+    restated = split_adjusted_dividends(dividends, splits)
+    wrong = ~np.isclose(restated["Dividends"].to_numpy(), expected, rtol=1e-12)
+    assert not wrong.any(), f"split restatement differs:\n{restated[wrong]}"
+    # Reverse split (1:4): adjusted payouts stay, unadjusted ones are scaled up
+    a = _quarterly("A", 1.0)
+    reverse = pd.DataFrame({"Symbol": ["A"], "Date": [SPLIT_DAY], "Ratio": [0.25]})
+    for reported, want in ((a["Dividends"], a["Dividends"]), (np.where(a["Date"] < SPLIT_DAY, 0.25, 1.0), 1.0)):
+        out = split_adjusted_dividends(a.assign(Dividends=reported), reverse)["Dividends"].to_numpy()
+        assert np.allclose(out, want), f"reverse split: {out}"
+    return f"{len(dividends)} payouts, {int((restated['Split_factor'] != 1).sum())} restated"
+
+
+CHECKS = {
+    "payout yields": check_payout_yields,
+    "split restatement": check_split_restatement,
+    "backtest raw prices": check_backtest_raw_prices,
+    "backtest without rebalances": check_backtest_without_rebalances,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(CHECKS), help="run only these checks")
+    args = parser.parse_args(argv)
+    for name in args.only or CHECKS:
+        print(f"✅ {name:<28} {CHECKS[name]()}")
+
+
+if __name__ == "__main__":
+    main()
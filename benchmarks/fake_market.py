@@ -0,0 +1,226 @@
+"""
+Recorded or synthetic stand-in for yfinance and the investing.com calendar.
+
+FakeMarket has the same Ticker(...) / download(...) surface the pipelines use,
+so it can be installed with stock_div.backend.use_backend(). Symbols found in
+a fixture folder are replayed from disk; every other symbol gets a
+deterministic synthetic history, so any universe size works offline.
+
+Record fixtures from the live APIs once with:
+
+    python -m benchmarks.fake_market record ./benchmarks/fixtures D05.SI BBCA.JK
+"""
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+SECTORS = ["Financials", "Energy", "Basic Materials", "Consumer Non-Cyclical", "Infrastructure", "Property"]
+DIVIDEND_TYPES = ["Annual", "Interim", "Final", "Special"]
+
+
+def synthetic_symbols(n, suffix=".JK"):
+    return [f"T{i:05d}{suffix}" for i in range(n)]
+
+
+class FakeTicker:
+    def __init__(self, market, symbol):
+        self.market = market
+        self.ticker = symbol
+
+    def history(self, period=None, start=None, **kwargs):
+        self.market._request("history")
+        return self.market.frame(self.ticker, period=period, start=start)
+
+    @property
+    def history_metadata(self):
+        # yfinance fills this in from the history response; no extra request
+        return {"currency": self.market.info(self.ticker)["currency"]}
+
+    @property
+    def dividends(self):
+        self.market._request("dividends")
+        divs = self.market.frame(self.ticker)["Dividends"]
+        return divs[divs > 0]
+
+    @property
+    def splits(self):
+        self.market._request("splits")
+        splits = self.market.frame(self.ticker)["Stock Splits"]
+        return splits[splits > 0]
+
+    @property
+    def actions(self):
+        self.market._request("actions")
+        actions = self.market.frame(self.ticker)[["Dividends", "Stock Splits"]]
+        return actions[(actions != 0).any(axis=1)]
+
+    @property
+    def info(self):
+        self.market._request("info")
+        return self.market.info(self.ticker)
+
+    @property
+    def fast_info(self):
+        self.market._request("fast_info")
+        info = self.market.info(self.ticker)
+        return {"marketCap": info["marketCap"], "currency": info["currency"], "lastPrice": info["currentPrice"]}
+
+
+class FakeMarket:
+    """
+    Offline market-data backend.
+
+    Args:
+        years (int): length of every synthetic history
+        latency (float): seconds slept per request, to make concurrency measurable
+        fixture_dir (str, optional): folder written by record_fixtures()
+        seed (int): base seed for the synthetic data
+    """
+
+    def __init__(self, years=10, latency=0.0, fixture_dir=None, seed=0):
+        self.years = years
+        self.latency = latency
+        self.fixture_dir = fixture_dir
+        self.seed = seed
+        end = pd.Timestamp.now().normalize()
+        self.dates = pd.bdate_range(end - pd.DateOffset(years=years), end, name="Date")
+        self.requests = Counter()
+        self._lock = threading.Lock()
+
+    def _request(self, kind):
+        with self._lock:
+            self.requests[kind] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _fixture(self, symbol):
+        if not self.fixture_dir:
+            return None
+        path = os.path.join(self.fixture_dir, f"{symbol.replace('.', '_')}.pkl")
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _rng(self, symbol):
+        return np.random.default_rng(zlib.crc32(symbol.encode()) + self.seed)
+
+    def _synthetic_history(self, symbol):
+        rng = self._rng(symbol)
+        dates = self.dates
+        close = 1000 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, len(dates))))
+        high = close * (1 + rng.uniform(0, 0.02, len(dates)))
+        low = close * (1 - rng.uniform(0, 0.02, len(dates)))
+
+        # One or two payouts a year at a 2-8% yield, and a rare split
+        dividends = np.zeros(len(dates))
+        payouts = np.flatnonzero(rng.random(len(dates)) < rng.choice([1, 2]) / 252)
+        dividends[payouts] = close[payouts] * rng.uniform(0.02, 0.08) / 1.5
+        splits = np.zeros(len(dates))
+        if rng.random() < 0.05:
+            splits[rng.integers(len(dates))] = rng.choice([2.0, 5.0, 10.0])
+
+        return pd.DataFrame({
+            "Open": close, "High": high, "Low": low, "Close": close,
+            "Volume": rng.integers(1_000, 10_000_000, len(dates)),
+            "Dividends": dividends, "Stock Splits": splits,
+        }, index=dates)
+
+    def frame(self, symbol, period=None, start=None):
+        """Full daily history for a symbol, sliced like history(period=...) or history(start=...)."""
+        fixture = self._fixture(symbol)
+        history = fixture["history"] if fixture is not None else self._synthetic_history(symbol)
+        if start is not None:
+            history = history[history.index >= pd.Timestamp(start)]
+        elif period and period != "max":
+            years = int(period.rstrip("y")) if period.endswith("y") else 1
+            history = history[history.index >= history.index[-1] - pd.DateOffset(years=years)]
+        return history
+
+    def info(self, symbol):
+        fixture = self._fixture(symbol)
+        if fixture is not None:
+            return fixture["info"]
+        rng = self._rng(symbol)
+        price = float(self._synthetic_history(symbol)["Close"].iloc[-1])
+        return {
+            "shortName": f"Synthetic {symbol}",
+            "sector": SECTORS[int(rng.integers(len(SECTORS)))],
+            "marketCap": int(rng.integers(10**9, 10**15)),
+            "currency": "IDR" if symbol.endswith(".JK") else "SGD",
+            "currentPrice": price,
+        }
+
+    def Ticker(self, symbol):
+        return FakeTicker(self, symbol)
+
+    def download(self, tickers, period=None, start=None, group_by="ticker", **kwargs):
+        """Multi-symbol download, columns (symbol, field) like yfinance with group_by='ticker'."""
+        self._request("download")
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {symbol: self.frame(symbol, period=period, start=start) for symbol in tickers}
+        return pd.concat(frames, axis=1)
+
+    def calendar_response(self, rows, date_from="2025-02-01", date_to="2025-02-28"):
+        """A dividends-calendar JSON response shaped like investing.com's, with `rows` data rows."""
+        fixture = self.fixture_dir and os.path.join(self.fixture_dir, "calendar.json")
+        if fixture and os.path.exists(fixture):
+            with open(fixture, encoding="utf-8") as f:
+                return json.load(f)
+        return {"data": synthetic_calendar_html(rows, self.seed), "rows_num": rows,
+                "dateFrom": date_from, "dateTo": date_to}
+
+
+def synthetic_calendar_html(rows, seed=0, rows_per_day=40):
+    """Calendar table rows in the investing.com markup the parser expects."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for i in range(rows):
+        if i % rows_per_day == 0:
+            day = pd.Timestamp("2025-02-03") + pd.Timedelta(days=i // rows_per_day)
+            parts.append(f'<tr tablesorterDivider=""><td colspan="7" class="theDay">{day:%A, %d %B %Y}</td></tr>')
+        code = f"T{i:05d}"
+        dividend = f"{rng.uniform(1, 5000):,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+        yield_pct = f"{rng.uniform(0.5, 12):.2f}".replace(".", ",")
+        parts.append(
+            "<tr>"
+            '<td class="flag"><span title="Indonesia" class="ceFlags Indonesia">&nbsp;</span></td>'
+            f'<td class="left noWrap"><span class="earnCalCompanyName middle">Synthetic Company {i}</span>'
+            f'&nbsp;(<a href="/equities/{code.lower()}" class="bold middle">{code}</a>)</td>'
+            "<td>03/02/2025</td>"
+            f"<td>{dividend}</td>"
+            f'<td class="textNum"><span class="dividendIcon" title="{DIVIDEND_TYPES[i % len(DIVIDEND_TYPES)]}"></span></td>'
+            "<td>28/02/2025</td>"
+            f"<td>{yield_pct}%</td>"
+            "</tr>"
+        )
+    return "<table>" + "".join(parts) + "</table>"
+
+
+def record_fixtures(fixture_dir, symbols):
+    """Save live yfinance responses so FakeMarket can replay them offline."""
+    import yfinance as yf
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    for symbol in symbols:
+        ticker = yf.Ticker(symbol)
+        history = ticker.history(period="max", auto_adjust=True, actions=True)
+        if getattr(history.index, "tz", None) is not None:
+            history.index = history.index.tz_localize(None)
+        with open(os.path.join(fixture_dir, f"{symbol.replace('.', '_')}.pkl"), "wb") as f:
+            pickle.dump({"history": history, "info": ticker.info}, f)
+        print(f"Recorded {symbol}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] != "record":
+        sys.exit("usage: python -m benchmarks.fake_market record FIXTURE_DIR SYMBOL [SYMBOL ...]")
+    record_fixtures(sys.argv[2], sys.argv[3:])
@@ -0,0 +1,4 @@
+"""
+Shared data helpers used by the kompas100, ticker_dividend and
+ticker_info_to_csv marimo apps.
+"""
@@ -0,0 +1,243 @@
+"""
+Headless batch entry point for cron runs.
+
+    python -m stock_div kompas100 [--universe stocks|sg ...] [--format txt|md|html|json ...] [--csv PATH] [--chart]
+    python -m stock_div dividend D05.SI [BBCA.JK ...]
+    python -m stock_div info kompas100|sti|both [UNIVERSE ...]
+    python -m stock_div serve [--universe stocks] [--port 8765]
+    python -m stock_div refresh [--universe stocks] [--at 18:00] [--once] [--full]
+    python -m stock_div backtest [--universe stocks] [--metric avg_5y] [--top 20 ...] [--freq M ...]
+
+Put --profile metrics.json (or metrics.prom for Prometheus text) before the
+command to record stage timings, fetch latencies and cache counters.
+
+Each command imports only the pipeline modules it needs; marimo, IPython and
+the plotting stack are never loaded unless --chart is passed.
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from stock_div.universes import MARKETS, market_label
+
+
+def _per_universe(path, name, several):
+    # report.txt -> report_sg.txt when one run covers several universes
+    if not several:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{name}{ext}"
+
+
+def run_kompas100(args):
+    from stock_div import universes
+    from stock_div.kompas import analyze_universe, top_lists, write_report
+    from stock_div.report import FORMATS
+
+    today = datetime.now()
+    names = list(dict.fromkeys(args.universes or ["stocks"]))
+    several = len(names) > 1
+    jobs = []
+    for name in names:
+        df_results = analyze_universe(getattr(universes, name), today)
+        top_2y, top_5y, top_10y, triple_overlap = top_lists(df_results, args.top, args.elite_rule)
+        write_report(today, top_2y, top_5y, top_10y, triple_overlap, path=_per_universe(args.report, name, several),
+                     formats=args.formats or FORMATS, n=args.top, rule=args.elite_rule)
+        if args.csv:
+            csv_path = _per_universe(args.csv, name, several)
+            df_results.to_csv(csv_path, index=False)
+            print(f"✅ Yield analysis saved to {csv_path}")
+        filename = f"{market_label(name)}_Performance_Report_{today.strftime('%Y%m%d')}.png"
+        jobs.append((top_2y, top_5y, top_10y, triple_overlap, filename))
+
+    if args.chart:
+        import matplotlib
+        matplotlib.use("Agg")
+        from stock_div.charts import render_charts
+
+        # One job per universe, so charts that need drawing render in parallel
+        render_charts(jobs, dpi=args.chart_dpi, n=args.top, rule=args.elite_rule)
+
+
+def run_dividend(args):
+    from stock_div.dividend_history import save_annual_dividend_history
+
+    failed = 0
+    for symbol in args.symbols:
+        result, _, _ = save_annual_dividend_history(symbol, save_csv=not args.no_csv)
+        failed += result is None
+    return 1 if failed else 0
+
+
+def run_info(args):
+    from stock_div.stock_info import fetch_and_save_universes
+
+    names = ["kompas100", "sti"] if args.universe == ["both"] else args.universe
+    try:
+        fetch_and_save_universes(names, save_csv=not args.no_csv)
+    except KeyError as e:
+        print(f"⚠️ {e.args[0]}")
+        return 1
+
+
+def run_serve(args):
+    from datetime import timedelta
+
+    from stock_div.api import serve
+    from stock_div.universe_registry import load_registry
+
+    try:
+        universe = load_registry().get(args.universe)
+    except KeyError as e:
+        print(f"⚠️ {e.args[0]}")
+        return 1
+    try:
+        serve(args.universe, universe, args.host, args.port, timedelta(hours=args.refresh_hours))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_refresh(args):
+    from stock_div.dividend_calendar import DEFAULT_HEADERS, make_session
+    from stock_div.refresh_daemon import run_forever, run_once
+    from stock_div.report import FORMATS
+    from stock_div.universe_registry import load_registry
+
+    try:
+        universe = load_registry().get(args.universe)
+    except KeyError as e:
+        print(f"⚠️ {e.args[0]}")
+        return 1
+    headers = dict(DEFAULT_HEADERS, Cookie=args.cookie) if args.cookie else DEFAULT_HEADERS
+    options = dict(full=args.full, n=args.top, rule=args.elite_rule, report_path=args.report,
+                   formats=args.formats or FORMATS, chart=args.chart)
+    if args.once:
+        run_once(args.universe, universe, session=make_session(headers), **options)
+        return
+    try:
+        run_forever(args.universe, universe, at=args.at, headers=headers, **options)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_backtest(args):
+    from stock_div.backtest import Backtester, load_panel
+    from stock_div.universe_registry import load_registry
+
+    try:
+        universe = load_registry().get(args.universe)
+    except KeyError as e:
+        print(f"⚠️ {e.args[0]}")
+        return 1
+    panel = load_panel(universe.values())
+    if not len(panel):
+        print(f"⚠️ No cached prices for {args.universe}; run `python -m stock_div kompas100` first")
+        return 1
+    print(f"Backtesting {len(panel)} of {len(universe)} symbols from the price cache")
+
+    weights = {}
+    for spec in args.metrics or ["avg_5y"]:
+        name, _, weight = spec.partition("=")
+        weights[name] = float(weight or 1.0)
+    try:
+        backtester = Backtester(panel, start=args.start, end=args.end)
+        if len(args.top) * len(args.freq) * len(args.cost_bps) > 1:
+            table = backtester.sweep({"+".join(weights): weights}, args.top, args.freq, args.cost_bps)
+        else:
+            periods, stats = backtester.run(weights, args.top[0], args.freq[0], args.cost_bps[0])
+            table = periods.assign(holdings=periods["holdings"].str.join(" "))
+            print(stats.to_string())
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return 1
+    # A single run lists its most recent periods; the CSV has all of them
+    shown = table if "strategy" in table else table.drop(columns="holdings").tail(12)
+    print(shown.to_string(index=False))
+    if args.csv:
+        table.to_csv(args.csv, index=False)
+        print(f"✅ Backtest saved to {args.csv}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m stock_div", description="Run the dividend pipelines without the marimo UI.")
+    parser.add_argument("--profile", metavar="PATH", help="write run metrics here (.json, or .prom/.txt for Prometheus text)")
+    parser.add_argument("--profile-format", choices=["json", "prometheus"], help="override the format implied by the extension")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    kompas = commands.add_parser("kompas100", help="multi-horizon yield and drawdown report (kompas100.py)")
+    kompas.add_argument("--universe", dest="universes", nargs="+", choices=list(MARKETS),
+                        help="one or more universes (default: stocks); several get _<name> report and CSV paths")
+    kompas.add_argument("--top", type=int, default=20, help="size of each top-N list")
+    kompas.add_argument("--elite-rule", choices=["intersection", "union"], default="intersection",
+                        help="elite list: stocks in all top-N lists, or in any of them")
+    kompas.add_argument("--report", default="dividend_report_final.txt", help="report path; other formats swap the extension")
+    kompas.add_argument("--format", dest="formats", action="append", choices=["txt", "md", "html", "json"],
+                        help="report format, repeatable (default: all)")
+    kompas.add_argument("--csv", help="also save the full results table to this CSV path")
+    kompas.add_argument("--chart", action="store_true", help="render the 2x2 PNG chart")
+    kompas.add_argument("--chart-dpi", type=int, default=300, help="chart resolution, e.g. 72 for a quick preview")
+    kompas.set_defaults(handler=run_kompas100)
+
+    dividend = commands.add_parser("dividend", help="annual dividend history per ticker (ticker_dividend.py)")
+    dividend.add_argument("symbols", nargs="+", help="Yahoo Finance tickers, e.g. D05.SI")
+    dividend.add_argument("--no-csv", action="store_true", help="write Parquet only")
+    dividend.set_defaults(handler=run_dividend)
+
+    info = commands.add_parser("info", help="company, sector and market cap lists (ticker_info_to_csv.py)")
+    info.add_argument("universe", nargs="+", help="registered universe names (kompas100, sti, stocks, ...) or both")
+    info.add_argument("--no-csv", action="store_true", help="write Parquet only")
+    info.set_defaults(handler=run_info)
+
+    api = commands.add_parser("serve", help="local JSON API over the precomputed analytics")
+    api.add_argument("--universe", default="stocks", help="registered universe name")
+    api.add_argument("--host", default="127.0.0.1")
+    api.add_argument("--port", type=int, default=8765)
+    api.add_argument("--refresh-hours", type=float, default=6, help="time between background refreshes")
+    api.set_defaults(handler=run_serve)
+
+    refresh = commands.add_parser("refresh", help="daily incremental refresh of the symbols on the dividend calendar")
+    refresh.add_argument("--universe", default="stocks", help="registered universe name")
+    refresh.add_argument("--at", default="18:00", help="local time of the daily run, HH:MM")
+    refresh.add_argument("--once", action="store_true", help="run one refresh now and exit")
+    refresh.add_argument("--full", action="store_true", help="reanalyze the whole universe")
+    refresh.add_argument("--cookie", help="Cookie header for investing.com, if it refuses plain requests")
+    refresh.add_argument("--top", type=int, default=20, help="size of each top-N list")
+    refresh.add_argument("--elite-rule", choices=["intersection", "union"], default="intersection")
+    refresh.add_argument("--report", default="dividend_report_final.txt", help="report path; other formats swap the extension")
+    refresh.add_argument("--format", dest="formats", action="append", choices=["txt", "md", "html", "json"],
+                         help="report format, repeatable (default: all)")
+    refresh.add_argument("--chart", action="store_true", help="also render the 2x2 PNG chart")
+    refresh.set_defaults(handler=run_refresh)
+
+    backtest = commands.add_parser("backtest", help="top-N yield strategy backtest over the cached prices, offline")
+    backtest.add_argument("--universe", default="stocks", help="registered universe name")
+    backtest.add_argument("--metric", dest="metrics", action="append",
+                          help="ranking metric, optionally weighted, e.g. avg_5y or drawdown_1y=-0.1; repeatable (default: avg_5y)")
+    backtest.add_argument("--top", type=int, nargs="+", default=[20], help="names held; several values run a sweep")
+    backtest.add_argument("--freq", nargs="+", choices=["W", "M", "Q", "Y"], default=["M"], help="rebalance frequency")
+    backtest.add_argument("--cost-bps", type=float, nargs="+", default=[0.0], help="trading cost per side in basis points")
+    backtest.add_argument("--start", help="first rebalance date, YYYY-MM-DD")
+    backtest.add_argument("--end", help="last rebalance date, YYYY-MM-DD")
+    backtest.add_argument("--csv", help="save the periods (or the sweep table) to this CSV path")
+    backtest.set_defaults(handler=run_backtest)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.profile:
+        return args.handler(args) or 0
+
+    from stock_div import profiling
+
+    profiling.enable()
+    try:
+        with profiling.stage(f"command.{args.command}"):
+            return args.handler(args) or 0
+    finally:
+        profiling.write(args.profile, args.profile_format)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
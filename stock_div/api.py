@@ -0,0 +1,220 @@
+"""
+Local HTTP API serving the dividend analytics as JSON.
+
+    python -m stock_div serve --universe stocks --port 8765
+
+A background task rebuilds a snapshot of every response body on a timer (the
+price and info caches mean only stale rows are fetched). Requests are served
+from that in-memory snapshot on the asyncio loop, so they never wait on Yahoo.
+
+Routes:
+    GET /health                      universe, symbol count, last refresh
+    GET /results                     one row per stock: price, drawdowns, yields
+    GET /yields, /drawdowns          {symbol: {column: value}}
+    GET /dividends/<symbol>          annual dividend totals and yield
+    GET /info/<symbol>               shortName, sector, marketCap
+    (<symbol> is case-insensitive, e.g. /dividends/bbca.jk)
+    GET /top/<2y|5y|10y|elite>       top-N list; ?n=20&rule=intersection|union (n capped at 200)
+"""
+import asyncio
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from stock_div.dividend_yield import annual_dividends
+from stock_div.info_cache import fetch_info
+from stock_div.kompas import analyze_universe
+from stock_div.lookup_cache import normalize
+from stock_div.price_cache import fetch_universe
+from stock_div.ranking import DEFAULT_CRITERIA, RULES, rank
+from stock_div.stock_info import INFO_FIELDS
+
+HOST = "127.0.0.1"
+PORT = 8765
+REFRESH_INTERVAL = timedelta(hours=6)
+TOP_N = 20
+# Largest ?n= served, and how many custom top-N bodies a snapshot keeps
+MAX_TOP_N = 200
+TOP_MEMO_SIZE = 64
+DRAWDOWN_COLUMNS = ["high_1y_pct", "ath_pct", "drawdown_2y", "drawdown_5y", "drawdown_10y"]
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+
+
+def _json(payload):
+    return json.dumps(payload, ensure_ascii=False, default=str).encode()
+
+
+class Snapshot:
+    """Pre-encoded response bodies for one refresh, plus the results table for custom top-N queries."""
+
+    def __init__(self, universe_name, results, routes, refreshed_at):
+        self.results = results
+        self.routes = routes
+        self.refreshed_at = refreshed_at
+        self.routes["/health"] = _json({
+            "status": "ok", "universe": universe_name, "symbols": len(results),
+            "refreshed_at": refreshed_at.isoformat(timespec="seconds"),
+        })
+        self._top = OrderedDict()
+
+    def top(self, label, n, rule):
+        # n past the table size gives the same lists, so clamping also bounds the distinct keys;
+        # recent queries are kept in a small LRU, and a miss ranks one small table
+        n = min(n, len(self.results), MAX_TOP_N)
+        key = (label, n, rule)
+        body = self._top.get(key)
+        if body is None:
+            tables, combined = rank(self.results, n, DEFAULT_CRITERIA, rule)
+            table = combined if label == "elite" else tables[label]
+            body = self._top[key] = table.to_json(orient="records").encode()
+            if len(self._top) > TOP_MEMO_SIZE:
+                self._top.popitem(last=False)
+        else:
+            self._top.move_to_end(key)
+        return body
+
+
+def build_snapshot(universe_name, universe, executor=None):
+    """Runs the pipelines once and encodes every route. Blocking; the server runs it in a thread."""
+    as_of = datetime.now()
+    panel = fetch_universe(universe.values(), executor=executor, compact=True)
+    results = analyze_universe(universe, as_of, executor=executor, panel=panel)
+    annual = annual_dividends(panel.dividends_with_prices(), panel.latest_prices())
+    infos = fetch_info(universe.values(), INFO_FIELDS, executor=executor)
+
+    by_symbol = results.set_index("symbol")
+    yield_columns = [c for c in results.columns if c.startswith("avg_")]
+    routes = {
+        "/results": results.to_json(orient="records").encode(),
+        "/yields": by_symbol[yield_columns].to_json(orient="index").encode(),
+        "/drawdowns": by_symbol[DRAWDOWN_COLUMNS].to_json(orient="index").encode(),
+    }
+    for symbol, rows in annual.groupby("Symbol"):
+        routes[f"/dividends/{symbol}"] = rows.drop(columns="Symbol").round(4).to_json(orient="records").encode()
+    for symbol, info in infos.items():
+        if not isinstance(info, Exception):
+            routes[f"/info/{symbol}"] = _json(info)
+
+    snapshot = Snapshot(universe_name, results, routes, as_of)
+    # Default top lists are warmed here, not on the first request
+    for label in (*DEFAULT_CRITERIA, "elite"):
+        routes[f"/top/{label}"] = snapshot.top(label, TOP_N, RULES[0])
+    return snapshot
+
+
+class AnalyticsServer:
+    """
+    Serves the latest Snapshot over HTTP/1.1 with keep-alive.
+
+    Args:
+        universe_name (str): label reported by /health
+        universe (dict): display name -> Yahoo ticker
+        refresh_interval (timedelta): time between snapshot rebuilds
+        executor (FetchExecutor, optional): defaults to the process-wide shared executor
+    """
+
+    def __init__(self, universe_name, universe, host=HOST, port=PORT, refresh_interval=REFRESH_INTERVAL, executor=None):
+        self.universe_name = universe_name
+        self.universe = universe
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval
+        self.executor = executor
+        self.snapshot = None
+
+    async def refresh_forever(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # Swapping the reference is atomic, so readers see the old or the new snapshot, never a mix
+                self.snapshot = await loop.run_in_executor(
+                    None, build_snapshot, self.universe_name, self.universe, self.executor
+                )
+                print(f"✅ Snapshot refreshed: {len(self.snapshot.results)} symbols")
+            except Exception as e:
+                print(f"⚠️ Refresh failed, still serving the previous snapshot: {e}")
+            await asyncio.sleep(self.refresh_interval.total_seconds())
+
+    def respond(self, method, target):
+        """Returns (status, body) for one request, from memory only."""
+        if method != "GET":
+            return 405, _json({"error": "only GET is supported"})
+        snapshot = self.snapshot
+        if snapshot is None:
+            return 503, _json({"error": "first refresh still running"})
+
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query)
+        if path.startswith("/top/") and url.query:
+            label = path.removeprefix("/top/")
+            rule = query.get("rule", [RULES[0]])[0]
+            try:
+                n = int(query.get("n", [TOP_N])[0])
+            except ValueError:
+                return 400, _json({"error": "n must be an integer"})
+            if (label not in DEFAULT_CRITERIA and label != "elite") or rule not in RULES or n < 0:
+                return 400, _json({"error": f"use /top/<{'|'.join(DEFAULT_CRITERIA)}|elite>?n=<int>&rule=<{'|'.join(RULES)}>"})
+            return 200, snapshot.top(label, n, rule)
+
+        route, _, symbol = path.rpartition("/")
+        if route in ("/dividends", "/info"):
+            # Routes are keyed by the Yahoo ticker; match symbols the way lookup_cache does
+            path = f"{route}/{normalize(symbol)}"
+        body = snapshot.routes.get(path)
+        if body is None:
+            return 404, _json({"error": f"no route {path}"})
+        return 200, body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    status, body, version = 400, _json({"error": "malformed request line"}), "HTTP/1.0"
+                else:
+                    method, target, version = parts
+                    status, body = self.respond(method, target)
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection") != "close"
+                head = (
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        refresher = asyncio.create_task(self.refresh_forever())
+        print(f"Serving {self.universe_name} on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresher.cancel()
+
+
+def serve(universe_name, universe, host=HOST, port=PORT, refresh_interval=REFRESH_INTERVAL, executor=None):
+    """Blocks, serving the API until interrupted."""
+    asyncio.run(AnalyticsServer(universe_name, universe, host, port, refresh_interval, executor).serve())
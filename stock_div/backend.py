@@ -0,0 +1,39 @@
+"""
+Market-data backend used by every fetch.
+
+Defaults to the yfinance module. Benchmarks swap in a fake with the same
+`Ticker(...)` / `download(...)` surface through use_backend(), so the
+pipelines can run with no network.
+"""
+import threading
+from contextlib import contextmanager
+
+_backend = None
+_lock = threading.Lock()
+
+
+def market():
+    """Return the active backend, importing yfinance on first use."""
+    global _backend
+    with _lock:
+        if _backend is None:
+            import yfinance
+            _backend = yfinance
+        return _backend
+
+
+def set_backend(backend):
+    global _backend
+    with _lock:
+        _backend = backend
+
+
+@contextmanager
+def use_backend(backend):
+    """Temporarily route every fetch to `backend`."""
+    previous = market()
+    set_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_backend(previous)
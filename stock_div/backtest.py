@@ -0,0 +1,307 @@
+"""
+Vectorized backtests of top-N dividend strategies over the cached price panel.
+
+    python -m stock_div backtest --universe stocks --metric avg_5y --top 20 --freq M
+
+On every rebalance date the universe is ranked by a weighted sum of
+point-in-time metrics, the top N are bought in equal weight and held (their
+weights drifting with prices) until the next rebalance. Returns include
+reinvested dividends, and every strategy is compared with an equal-weight
+portfolio of all listed symbols rebalanced on the same dates.
+
+Metrics, named like the kompas.analyze_universe columns:
+    avg_{N}y        trailing N-year average annual dividend yield, as in dividend_yield.avg_annual_yields
+    drawdown_{N}y   distance from the N-year high in percent (high_1y_pct and ath_pct are aliases)
+
+Everything is computed on dense (dates x symbols) arrays built once per
+panel. A strategy is then a handful of (rebalances x symbols) operations, so
+a sweep costs milliseconds per parameter combination. Nothing is fetched: the
+panel comes from the price cache (load_panel) or from a CompactPanel at hand.
+
+The universe is today's constituent list, so results carry survivorship bias.
+"""
+import re
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from stock_div.compact_panel import CompactPanel
+from stock_div.price_cache import CACHE_DIR, load_cached
+
+FREQUENCIES = ("W", "M", "Q", "Y")
+# History needed before the first rebalance, so trailing metrics have something to read
+WARMUP_DAYS = 365
+# A symbol without a bar in this many trading days (suspended, delisted) is not bought
+STALE_ROWS = 10
+ALIASES = {"high_1y_pct": "drawdown_1y", "ath_pct": "drawdown_10y"}
+_METRIC = re.compile(r"^(avg|drawdown)_(\d+)y$")
+
+
+def load_panel(symbols, cache_dir=CACHE_DIR):
+    """CompactPanel of whatever the price cache holds for `symbols`; never makes a request."""
+    histories = {}
+    for symbol in dict.fromkeys(symbols):
+        entry = load_cached(symbol, cache_dir)
+        if entry is not None and not entry["history"].empty:
+            histories[symbol] = entry["history"]
+    return CompactPanel.from_histories(histories)
+
+
+def _ffill_rows(values):
+    """Forward-fills NaNs down each column; also returns the row of the last real value (-1 before the first)."""
+    rows = np.arange(len(values))[:, None]
+    last = np.maximum.accumulate(np.where(np.isnan(values), -1, rows), axis=0)
+    filled = values[np.maximum(last, 0), np.arange(values.shape[1])]
+    return np.where(last >= 0, filled, np.nan), last
+
+
+class Backtester:
+    """
+    Args:
+        panel (CompactPanel or DataFrame): cached prices, e.g. load_panel(universe.values())
+        adjusted (bool): closes are dividend-adjusted (fetch_universe's auto_adjust=True);
+            raw prices for yields and drawdowns are then recovered like dividend_yield.payout_yields
+        start, end (datetime, optional): first and last rebalance; start defaults to WARMUP_DAYS into the panel
+    """
+
+    def __init__(self, panel, adjusted=True, start=None, end=None):
+        if not isinstance(panel, CompactPanel):
+            panel = CompactPanel.from_panel(panel)
+        if not len(panel):
+            raise ValueError("no symbols with price history to backtest")
+        self.symbols = panel.symbols
+        self.days = np.unique(panel.days).astype(np.int64)
+        self.dates = pd.to_datetime(self.days.astype("datetime64[D]"))
+        n_rows, n_cols = len(self.days), len(self.symbols)
+
+        rows = np.searchsorted(self.days, panel.days)
+        cols = np.repeat(np.arange(n_cols), np.diff(panel.offsets))
+        close = np.full((n_rows, n_cols), np.nan)
+        close[rows, cols] = panel.close
+        high = np.full((n_rows, n_cols), np.nan)
+        high[rows, cols] = panel.high
+        close, last_bar = _ffill_rows(close)
+        self.stale = np.arange(n_rows)[:, None] - last_bar > STALE_ROWS
+
+        dividends = panel.dividends_with_prices()
+        paid = np.zeros((n_rows, n_cols))
+        ex_rows = np.searchsorted(self.days, dividends["Date"].to_numpy().astype("datetime64[D]").astype(np.int64))
+        np.add.at(paid, (ex_rows, self.symbols.get_indexer(dividends["Symbol"])), dividends["Dividends"].to_numpy())
+        self.cum_dividends = np.vstack([np.zeros(n_cols), np.cumsum(paid, axis=0)])
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if adjusted:
+                # Total return is the adjusted close itself. The raw close is adjusted / multiplier,
+                # where each ex-date scales every earlier row by 1 / (1 + M * D / A_before)
+                factors = np.ones((n_rows, n_cols))
+                running = np.ones(n_cols)
+                for row in np.flatnonzero(paid[1:].any(axis=1))[::-1] + 1:
+                    step = 1 / (1 + running * paid[row] / close[row - 1])
+                    step = np.where(np.isfinite(step), step, 1.0)
+                    factors[row] = step
+                    running *= step
+                multiplier = np.vstack([np.cumprod(factors[::-1], axis=0)[::-1][1:], np.ones(n_cols)])
+                self.total_return = close
+                self.price = close / multiplier
+                high = high / multiplier
+            else:
+                growth = (close[1:] + paid[1:]) / close[:-1]
+                growth = np.where(np.isfinite(growth), growth, 1.0)
+                self.total_return = np.where(np.isnan(close), np.nan, np.vstack([np.ones(n_cols), np.cumprod(growth, axis=0)]))
+                self.price = close
+        self._high = np.where(np.isnan(high), -np.inf, high)
+
+        first = self.days[0] + WARMUP_DAYS
+        self.start = max(first, _day(start)) if start is not None else first
+        self.end = _day(end) if end is not None else self.days[-1]
+        self._cache = {}
+
+    def rebalance_rows(self, freq="M"):
+        """Row of the first trading day of every week, month, quarter or year between start and end; ValueError if none."""
+        if freq not in FREQUENCIES:
+            raise ValueError(f"freq must be one of {FREQUENCIES}, got {freq!r}")
+        dates = self.days.astype("datetime64[D]")
+        if freq == "W":
+            period = (self.days + 3) // 7  # Monday-based weeks; 1970-01-01 was a Thursday
+        elif freq == "Y":
+            period = dates.astype("datetime64[Y]").astype(np.int64)
+        else:
+            period = dates.astype("datetime64[M]").astype(np.int64) // (3 if freq == "Q" else 1)
+        first = np.flatnonzero(np.diff(period, prepend=period[0] - 1))
+        rows = first[(self.days[first] >= self.start) & (self.days[first] <= self.end)]
+        if not len(rows):
+            raise ValueError("no rebalance dates between start and end")
+        return rows
+
+    def _cutoff_rows(self, rows, years):
+        # First row on or after `date - 365*N days`, the same window rule as the report
+        return np.searchsorted(self.days, self.days[rows] - 365 * years, side="left")
+
+    def _avg_yield(self, rows, years):
+        cum = self.cum_dividends
+        cutoff = self._cutoff_rows(rows, years)
+        total = cum[rows + 1] - cum[cutoff]
+
+        # Average over the calendar years that paid anything, like avg_annual_yields
+        calendar = self.days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64)
+        year_starts = np.searchsorted(calendar, np.arange(calendar[0], calendar[-1] + 2))
+        first_year, last_year = calendar[cutoff] - calendar[0], calendar[rows] - calendar[0]
+        paying = np.zeros_like(total)
+        for k in range(years + 2):
+            year = np.minimum(first_year + k, len(year_starts) - 2)
+            lo = np.maximum(cutoff, year_starts[year])
+            hi = np.minimum(rows + 1, year_starts[year + 1])
+            inside = (first_year + k <= last_year) & (hi > lo)
+            paying += (cum[hi] - cum[lo] > 0) & inside[:, None]
+
+        price = self.price[rows]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where((paying > 0) & (price > 0), total / paying / price * 100, np.nan)
+
+    def _drawdown(self, rows, years):
+        cutoff = self._cutoff_rows(rows, years)
+        # Window highs: max over the segments between all cutoffs and rebalance rows,
+        # then a sparse table over those few segments answers each window in two lookups
+        bounds = np.unique(np.concatenate([cutoff, rows + 1]))
+        bounds = bounds[bounds < len(self.days)]
+        table = [np.maximum.reduceat(self._high, bounds, axis=0)]
+        while 2 ** len(table) <= len(bounds):
+            half = 2 ** (len(table) - 1)
+            previous = table[-1]
+            table.append(np.maximum(previous[:-half], previous[half:]))
+        lo = np.searchsorted(bounds, cutoff)
+        hi = np.searchsorted(bounds, rows + 1)
+        level = np.floor(np.log2(np.maximum(hi - lo, 1))).astype(int)
+        highs = np.empty((len(rows), len(self.symbols)))
+        for k in np.unique(level):
+            pick = level == k
+            highs[pick] = np.maximum(table[k][lo[pick]], table[k][hi[pick] - 2 ** k])
+
+        price = self.price[rows]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(np.isfinite(highs) & (highs > 0), (price / highs - 1) * 100, np.nan)
+
+    def metric(self, name, freq="M"):
+        """(rebalances x symbols) values of one metric on the rebalance dates; cached."""
+        key = (ALIASES.get(name, name), freq)
+        if key not in self._cache:
+            match = _METRIC.match(key[0])
+            if match is None:
+                raise ValueError(f"unknown metric {name!r}; use avg_<N>y, drawdown_<N>y or {', '.join(ALIASES)}")
+            kind, years = match.group(1), int(match.group(2))
+            rows = self.rebalance_rows(freq)
+            self._cache[key] = self._avg_yield(rows, years) if kind == "avg" else self._drawdown(rows, years)
+        return self._cache[key]
+
+    def _growth(self, freq):
+        key = ("growth", freq)
+        if key not in self._cache:
+            rows = self.rebalance_rows(freq)
+            ends = np.append(rows[1:], np.searchsorted(self.days, self.end, side="right") - 1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                growth = self.total_return[ends] / self.total_return[rows]
+            tradable = np.isfinite(growth) & ~self.stale[rows] & (self.price[rows] > 0)
+            self._cache[key] = (np.where(tradable, growth, np.nan), tradable, ends)
+        return self._cache[key]
+
+    def scores(self, weights, freq="M"):
+        """Weighted sum of metrics per rebalance and symbol; NaN where any weighted metric is missing."""
+        return sum(weight * self.metric(name, freq) for name, weight in weights.items())
+
+    def _simulate(self, weights, n, freq, cost_bps):
+        growth, tradable, ends = self._growth(freq)
+        score = np.where(tradable, self.scores(weights, freq), np.nan)
+        eligible = np.isfinite(score)
+        k = min(max(n, 1), len(self.symbols))
+        top = np.argpartition(np.where(eligible, -score, np.inf), k - 1, axis=1)[:, :k]
+        picked = np.take_along_axis(eligible, top, axis=1)
+        holdings = np.zeros_like(score)
+        np.put_along_axis(holdings, top, picked / np.maximum(picked.sum(axis=1, keepdims=True), 1), axis=1)
+        benchmark = tradable / np.maximum(tradable.sum(axis=1, keepdims=True), 1)
+        return holdings, _returns(holdings, growth, cost_bps), _returns(benchmark, growth, cost_bps), ends
+
+    def run(self, weights, n=20, freq="M", cost_bps=0.0):
+        """
+        One strategy.
+
+        Args:
+            weights (dict): {metric: weight}, like ranking criteria; negative weights favour low values
+            n (int): names held after each rebalance
+            freq (str): "W", "M", "Q" or "Y"
+            cost_bps (float): trading cost per side, in basis points of the traded value
+
+        Returns:
+            (periods DataFrame, stats Series). periods has one row per holding period with
+            the held symbols and both returns in percent; stats comes from summarize().
+        """
+        holdings, (returns, turnover), (bench_returns, _), ends = self._simulate(weights, n, freq, cost_bps)
+        rows = self.rebalance_rows(freq)
+        held = [list(self.symbols[np.flatnonzero(row)]) for row in holdings > 0]
+        periods = pd.DataFrame({
+            "start": self.dates[rows], "end": self.dates[ends], "holdings": held,
+            "return_%": returns * 100, "benchmark_%": bench_returns * 100, "turnover_%": turnover * 100,
+            "value": np.cumprod(1 + returns), "benchmark_value": np.cumprod(1 + bench_returns),
+        })
+        return periods, summarize(returns, bench_returns, turnover, self.days[rows[0]], self.days[ends[-1]])
+
+    def sweep(self, criteria, ns=(20,), freqs=("M",), costs_bps=(0.0,)):
+        """
+        Every combination of criteria x N x frequency x cost, one stats row each.
+
+        Args:
+            criteria (dict): {label: {metric: weight}}, e.g. ranking.DEFAULT_CRITERIA
+        """
+        records = []
+        for (label, weights), n, freq, cost in product(criteria.items(), ns, freqs, costs_bps):
+            _, (returns, turnover), (bench_returns, _), ends = self._simulate(weights, n, freq, cost)
+            rows = self.rebalance_rows(freq)
+            stats = summarize(returns, bench_returns, turnover, self.days[rows[0]], self.days[ends[-1]])
+            records.append({"strategy": label, "n": n, "freq": freq, "cost_bps": cost, **stats.to_dict()})
+        return pd.DataFrame(records)
+
+
+def _day(date):
+    return int((np.datetime64(pd.Timestamp(date).date(), "D") - np.datetime64("1970-01-01", "D")).astype(np.int64))
+
+
+def _returns(holdings, growth, cost_bps):
+    """Per-period net returns and one-way turnover for (rebalances x symbols) weights."""
+    growth = np.nan_to_num(growth, nan=1.0)
+    invested = holdings.sum(axis=1)
+    gross = np.where(invested > 0, (holdings * growth).sum(axis=1), 1.0)
+    drifted = holdings * growth / gross[:, None]
+    traded = np.abs(holdings - np.vstack([np.zeros(holdings.shape[1]), drifted[:-1]])).sum(axis=1)
+    return gross * (1 - cost_bps / 1e4 * traded) - 1, traded / 2
+
+
+def summarize(returns, benchmark, turnover, first_day, last_day):
+    """
+    Performance stats in percent (Sharpe as a ratio, risk-free rate 0).
+
+    Args:
+        returns, benchmark (ndarray): per-period returns as fractions
+        turnover (ndarray): per-period one-way turnover as fractions
+        first_day, last_day (int): day numbers spanning the periods
+    """
+    years = max((last_day - first_day) / 365.25, 1e-9)
+    per_year = len(returns) / years
+
+    def cagr(r):
+        return np.prod(1 + r) ** (1 / years) - 1
+
+    value = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(np.concatenate([[1.0], value]))[1:]
+    spread = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    return pd.Series({
+        "periods": len(returns),
+        "total_return_%": (value[-1] - 1) * 100 if len(value) else np.nan,
+        "cagr_%": cagr(returns) * 100,
+        "benchmark_cagr_%": cagr(benchmark) * 100,
+        "excess_cagr_%": (cagr(returns) - cagr(benchmark)) * 100,
+        "volatility_%": spread * np.sqrt(per_year) * 100,
+        "sharpe": returns.mean() / spread * np.sqrt(per_year) if spread else np.nan,
+        "max_drawdown_%": (value / peak - 1).min() * 100 if len(value) else np.nan,
+        "hit_rate_%": (returns > benchmark).mean() * 100,
+        "turnover_%": turnover.mean() * 100,
+    }).round(2)
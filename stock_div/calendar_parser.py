@@ -0,0 +1,120 @@
+"""
+Parsers for investing.com dividend-calendar HTML.
+
+Two engines return identical rows:
+
+* "lxml": one pass over the <tr> elements of an lxml tree, reading cells by
+  position and walking only the children it needs. This is the default.
+* "bs4": the original BeautifulSoup + CSS selector parser, kept as the
+  fallback when lxml is not installed and as the benchmark baseline.
+"""
+try:
+    from lxml import html as lxml_html
+except ImportError:  # optional, parse_calendar_rows falls back to bs4
+    lxml_html = None
+
+DEFAULT_ENGINE = "lxml" if lxml_html is not None else "bs4"
+
+
+def to_float(val):
+    # investing.com uses '.' for thousands and ',' for decimals
+    if not val or val == '-':
+        return None
+    return float(val.replace('.', '').replace(',', '.'))
+
+
+def _row(current_day, company, ticker, ex_date, dividend, div_type, pay_date, yield_pct):
+    return {
+        'calendar_day': current_day,
+        'company': company,
+        'ticker': ticker,
+        'ex_date': ex_date,
+        'dividend': to_float(dividend),
+        'dividend_type': div_type,
+        'payment_date': pay_date,
+        'yield_percent': to_float(yield_pct.replace('%', '')),
+    }
+
+
+def parse_bs4(html, current_day=None):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    for row in soup.select('tr'):
+        # Handle date divider rows
+        if row.has_attr('tablesorterdivider'):
+            day_cell = row.select_one('.theDay')
+            if day_cell:
+                current_day = day_cell.get_text(strip=True)
+            continue
+        cols = row.select('td')
+        if len(cols) < 7:
+            continue
+        company_cell = cols[1]
+        results.append(_row(
+            current_day,
+            company_cell.select_one('.earnCalCompanyName').get_text(strip=True),
+            company_cell.select_one('a.bold').get_text(strip=True),
+            cols[2].get_text(strip=True),
+            cols[3].get_text(strip=True),
+            cols[4].select_one('span')['title'],
+            cols[5].get_text(strip=True),
+            cols[6].get_text(strip=True),
+        ))
+    return results, current_day
+
+
+def _text(element):
+    return "".join(element.itertext()).strip()
+
+
+def _has_class(element, name):
+    return name in (element.get('class') or '').split()
+
+
+def parse_lxml(html, current_day=None):
+    # Wrapping keeps bare <tr> fragments inside a table for libxml2
+    root = lxml_html.fromstring(f"<table>{html}</table>")
+    results = []
+    for row in root.iter('tr'):
+        cols = [child for child in row if child.tag == 'td']
+        if row.get('tablesorterdivider') is not None:
+            for cell in cols:
+                if _has_class(cell, 'theDay'):
+                    current_day = _text(cell)
+                    break
+            continue
+        if len(cols) < 7:
+            continue
+
+        company = ticker = None
+        for child in cols[1].iter('span', 'a'):
+            if company is None and child.tag == 'span' and _has_class(child, 'earnCalCompanyName'):
+                company = _text(child)
+            elif ticker is None and child.tag == 'a' and _has_class(child, 'bold'):
+                ticker = _text(child)
+        type_span = next(cols[4].iter('span'))
+
+        results.append(_row(
+            current_day, company, ticker,
+            _text(cols[2]), _text(cols[3]), type_span.get('title'), _text(cols[5]), _text(cols[6]),
+        ))
+    return results, current_day
+
+
+ENGINES = {"bs4": parse_bs4}
+if lxml_html is not None:
+    ENGINES["lxml"] = parse_lxml
+
+
+def parse_calendar_rows(html, current_day=None, engine=None):
+    """
+    Parses one page of calendar HTML.
+
+    Returns (rows, current_day). current_day is the last date divider seen,
+    to be passed into the next page whose first rows belong to that day.
+    """
+    if not html or not html.strip():
+        return [], current_day
+    return ENGINES[engine or DEFAULT_ENGINE](html, current_day)
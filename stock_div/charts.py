@@ -0,0 +1,159 @@
+"""
+The 2x2 performance chart for the Kompas100 analysis.
+
+matplotlib and seaborn are imported inside the functions, so importing this
+module (or running the headless CLI without --chart) does not pay for them.
+
+render_charts keys every PNG by a hash of its input tables and dpi, so an
+unchanged top-20 list is copied from ./data/cache/charts instead of redrawn.
+"""
+import hashlib
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pandas as pd
+
+from stock_div import profiling
+from stock_div.sector_index import sector_index
+
+CHART_CACHE_DIR = "./data/cache/charts"
+PREVIEW_DPI = 72
+# Bump when the drawing code changes, so cached PNGs are not reused
+CHART_VERSION = 3
+ELITE_TITLES = {"intersection": '♛ ELITE: TOP {n} IN ALL HORIZONS', "union": '♛ ELITE: TOP {n} IN ANY HORIZON'}
+
+
+def plot_final_chart(df, yield_col, drawdown_col, title, ax, index=None):
+    import seaborn as sns
+    from matplotlib.ticker import FixedFormatter, FixedLocator
+
+    if df.empty:
+        ax.text(0.5, 0.5, 'No Data', ha='center', va='center')
+        return
+
+    # --- 1. PRIMARY AXIS: Green Bars ---
+    sns.barplot(x=yield_col, y='name', data=df, palette='Greens_r', ax=ax, alpha=0.8)
+    ax.set_title(title, fontsize=15, fontweight='bold', pad=25)
+    ax.set_xlabel('Avg Yield %', color='green', fontweight='bold')
+    ax.set_ylabel('')
+
+    # --- 2. SECONDARY AXIS: Red Dots & Log Scale ---
+    ax2 = ax.twiny()
+    sns.scatterplot(x=drawdown_col, y='name', data=df, color='red', s=100, edgecolor='black', zorder=5, ax=ax2)
+    ax2.set_xscale('symlog', linthresh=10)
+    ticks = [0, -5, -10, -20, -30, -50, -80]
+    ax2.set_xlim(-100, 2)
+    ax2.xaxis.set_major_locator(FixedLocator(ticks))
+    ax2.xaxis.set_major_formatter(FixedFormatter([f'{t}%' for t in ticks]))
+    # Dashed Line at -20%
+    ax2.axvline(-20, color='red', linestyle='--', linewidth=1.5, alpha=0.6)
+    # Dynamic Label for the top X-axis, extracts '2Y', '5Y', etc.
+    period_label = drawdown_col.split('_')[1].upper()
+    ax2.set_xlabel(f'Dist from {period_label} High % (Log Scale)', color='red', fontweight='bold')
+
+    # --- 3. COLOR CODE Y-AXIS NAMES BY SECTOR ---
+    index = index or sector_index()
+    for label in ax.get_yticklabels():
+        label.set_color(index.color(label.get_text()))
+        label.set_weight('bold')
+
+
+def render_performance_chart(top_2y, top_5y, top_10y, triple_overlap, filename, dpi=300, n=20, rule="intersection"):
+    """Draws the 2x2 grid, titled for top-`n` lists and the elite `rule`, saves it to filename and returns the figure."""
+    import matplotlib.patches as mpatches
+    import matplotlib.pyplot as plt
+
+    with profiling.stage("charts.plot"):
+        fig, axes = plt.subplots(2, 2, figsize=(22, 18))
+        plt.subplots_adjust(wspace=0.45, hspace=0.35)
+        # Pass the specific drawdown column for each plot
+        plot_final_chart(triple_overlap, 'avg_5y', 'drawdown_10y', ELITE_TITLES[rule].format(n=n), axes[0, 0])
+        plot_final_chart(top_2y, 'avg_2y', 'drawdown_2y', f'↗ TOP {n}: 2-YEAR YIELD', axes[0, 1])
+        plot_final_chart(top_5y, 'avg_5y', 'drawdown_5y', f'↗ TOP {n}: 5-YEAR YIELD', axes[1, 0])
+        plot_final_chart(top_10y, 'avg_10y', 'drawdown_10y', f'↗ TOP {n}: 10-YEAR YIELD', axes[1, 1])
+
+        # --- Sector Legend ---
+        # Only the sectors on the chart, so SG and IDX universes share one legend builder
+        index = sector_index()
+        shown = {index.sector(name) for table in (top_2y, top_5y, top_10y, triple_overlap) for name in table.get('name', [])}
+        legend_patches = [mpatches.Patch(color=color, label=sector) for sector, color in index.colors.items() if sector in shown]
+        fig.legend(handles=legend_patches, loc='lower center', ncol=5, bbox_to_anchor=(0.5, 0.05), title='Sectors')
+    with profiling.stage("charts.savefig"):
+        fig.savefig(filename, dpi=dpi, bbox_inches='tight', facecolor='white')
+    return fig
+
+
+def chart_key(tables, dpi, n=20, rule="intersection"):
+    """Content hash of the four input tables plus the render settings and titles."""
+    digest = hashlib.sha256(f"{CHART_VERSION}:{dpi}:{n}:{rule}".encode())
+    for table in tables:
+        digest.update(",".join(map(str, table.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(table, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _render_job(job, headless=True, profile=False):
+    """Draws one cached PNG; with `profile`, returns this process's metrics for the parent to merge."""
+    tables, path, dpi, n, rule = job
+    if profile:
+        profiling.enable()
+    import matplotlib
+    if headless:
+        # Worker processes have no display, and the notebook's backend must stay untouched
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    tmp_path = path + ".tmp.png"
+    fig = render_performance_chart(*tables, tmp_path, dpi, n, rule)
+    plt.close(fig)
+    os.replace(tmp_path, path)
+    return profiling.snapshot() if profile else None
+
+
+def render_charts(jobs, dpi=300, cache_dir=CHART_CACHE_DIR, max_workers=None, n=20, rule="intersection"):
+    """
+    Renders 2x2 charts, e.g. one per universe, reusing the PNG of any
+    job whose tables have not changed since the last run.
+
+    Charts that do need drawing run in a process pool when there is more
+    than one of them.
+
+    Args:
+        jobs (list): (top_2y, top_5y, top_10y, triple_overlap, filename) tuples
+        dpi (int): output resolution; PREVIEW_DPI is enough for on-screen use
+        cache_dir (str): folder holding one PNG per input hash
+        max_workers (int, optional): process pool size
+        n (int), rule (str): the top_lists arguments, for the chart titles
+
+    Returns the list of written filenames, in job order.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    cached_paths = []
+    pending = {}
+    for *tables, filename in jobs:
+        cached = os.path.join(cache_dir, f"{chart_key(tables, dpi, n, rule)}.png")
+        cached_paths.append(cached)
+        if not os.path.exists(cached):
+            pending[cached] = (tables, cached, dpi, n, rule)
+
+    profiling.count("chart_cache.hits", len(jobs) - len(pending))
+    profiling.count("chart_cache.misses", len(pending))
+
+    if len(pending) > 1:
+        # Workers keep their own metrics, so each job sends them back when profiling is on
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for snapshot in pool.map(partial(_render_job, profile=profiling.enabled()), pending.values()):
+                profiling.merge(snapshot)
+    else:
+        for job in pending.values():
+            _render_job(job, headless=False)
+
+    filenames = []
+    for (*_, filename), cached in zip(jobs, cached_paths):
+        shutil.copyfile(cached, filename)
+        status = "rendered" if cached in pending else "unchanged, reused cached chart"
+        print(f'✅ Success! Chart saved as: {filename} ({status})')
+        filenames.append(filename)
+    return filenames
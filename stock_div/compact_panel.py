@@ -0,0 +1,196 @@
+"""
+Compact, ragged price panel for large universes.
+
+The wide panel from fetch_universe keeps every field as float64 on the union
+of all trading dates, so each symbol pays for the other exchanges' holidays
+and for dates before it listed. CompactPanel keeps only what the analysis
+reads (Close, High, the non-zero Dividends and the Stock Splits), stores
+prices as float32 and dates as int32 day numbers, and lays all symbols end to
+end with an offsets array: rows offsets[i]:offsets[i + 1] belong to symbols[i].
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from stock_div.corporate_actions import split_adjusted_dividends
+
+FIELDS = ["Close", "High", "Dividends", "Stock Splits"]
+PRICE_DTYPE = np.float32
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _days(dates):
+    return (np.asarray(dates, dtype="datetime64[D]") - _EPOCH).astype(np.int32)
+
+
+class CompactPanel:
+    """
+    Args:
+        symbols (Index): one entry per symbol, in offsets order
+        offsets (ndarray): int64, len(symbols) + 1
+        days (ndarray): int32 days since 1970-01-01 per row
+        close, high (ndarray): PRICE_DTYPE per row
+        dividends (DataFrame): non-zero payouts only; categorical Symbol, Date, Dividends (float64)
+        sectors (Categorical, optional): sector per symbol
+        splits (DataFrame, optional): categorical Symbol, Date, Ratio (float64)
+    """
+
+    def __init__(self, symbols, offsets, days, close, high, dividends, sectors=None, splits=None):
+        self.symbols = pd.Index(symbols, name="Symbol")
+        self.offsets = offsets
+        self.days = days
+        self.close = close
+        self.high = high
+        self._dividends = dividends
+        self.sectors = sectors
+        self._splits = splits if splits is not None else pd.DataFrame({
+            "Symbol": pd.Categorical([], categories=self.symbols), "Date": pd.to_datetime([]).as_unit("ns"), "Ratio": []})
+
+    @classmethod
+    def from_histories(cls, histories, sectors=None, dtype=PRICE_DTYPE):
+        """Builds the panel straight from {symbol: history frame}, without a wide intermediate."""
+        symbols, lengths, days, close, high = [], [], [], [], []
+        div_codes, div_days, div_amounts = [], [], []
+        split_codes, split_days, split_ratios = [], [], []
+        for code, (symbol, history) in enumerate(histories.items()):
+            # Plain arrays per symbol; pandas indexing here dominates the build time otherwise
+            closes = history["Close"].to_numpy(dtype=float)
+            rows = ~np.isnan(closes)
+            dates = _days(history.index.to_numpy()[rows])
+            payouts = history["Dividends"].to_numpy(dtype=float)[rows] if "Dividends" in history else np.zeros(rows.sum())
+            paid = np.nan_to_num(payouts) > 0
+            ratios = history["Stock Splits"].to_numpy(dtype=float)[rows] if "Stock Splits" in history else np.zeros(rows.sum())
+            split = np.nan_to_num(ratios) > 0
+
+            symbols.append(symbol)
+            lengths.append(len(dates))
+            days.append(dates)
+            close.append(closes[rows].astype(dtype))
+            high.append(history["High"].to_numpy(dtype=float)[rows].astype(dtype))
+            div_codes.append(np.full(paid.sum(), code, dtype=np.int32))
+            div_days.append(dates[paid])
+            div_amounts.append(payouts[paid])
+            split_codes.append(np.full(split.sum(), code, dtype=np.int32))
+            split_days.append(dates[split])
+            split_ratios.append(ratios[split])
+        offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+
+        def join(parts, dtype):
+            return np.concatenate(parts).astype(dtype, copy=False) if parts else np.empty(0, dtype)
+
+        def events(codes, event_days, values, column):
+            return pd.DataFrame({
+                "Symbol": pd.Categorical.from_codes(join(codes, np.int32), categories=pd.Index(symbols)),
+                "Date": pd.to_datetime(join(event_days, np.int32).astype("datetime64[D]")).as_unit("ns"),
+                column: join(values, np.float64),
+            })
+
+        dividends = events(div_codes, div_days, div_amounts, "Dividends")
+        splits = events(split_codes, split_days, split_ratios, "Ratio")
+        return cls(symbols, offsets, join(days, np.int32), join(close, dtype), join(high, dtype), dividends, sectors, splits)
+
+    @classmethod
+    def from_panel(cls, panel, sectors=None, dtype=PRICE_DTYPE):
+        """Converts a wide fetch_universe panel."""
+        symbols = panel["Close"].columns
+        histories = {symbol: panel.xs(symbol, axis=1, level="Symbol") for symbol in symbols}
+        return cls.from_histories(histories, sectors, dtype)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _nonempty(self):
+        starts, ends = self.offsets[:-1], self.offsets[1:]
+        return np.flatnonzero(ends > starts)
+
+    def latest_prices(self):
+        """Last close per symbol (float64), like dividend_yield.latest_prices_from_panel."""
+        prices = np.full(len(self.symbols), np.nan)
+        keep = self._nonempty()
+        prices[keep] = self.close[self.offsets[keep + 1] - 1]
+        return pd.Series(prices, index=self.symbols)
+
+    def period_highs(self, windows, as_of=None):
+        """Same result as drawdown.period_highs on the wide High panel, one reduceat per window."""
+        as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.now()
+        keep = self._nonempty()
+        columns = {}
+        for label, years in windows.items():
+            # Bars are dated at midnight, so a cutoff partway through a day starts at the next bar
+            cutoff = np.ceil((as_of - timedelta(days=365 * years) - pd.Timestamp(0)) / pd.Timedelta(days=1))
+            values = np.where((self.days >= cutoff) & ~np.isnan(self.high), self.high, -np.inf)
+            highs = np.full(len(self.symbols), np.nan)
+            if len(keep):
+                window_max = np.maximum.reduceat(values, self.offsets[keep]).astype(float)
+                highs[keep] = np.where(np.isneginf(window_max), np.nan, window_max)
+            columns[label] = highs
+        return pd.DataFrame(columns, index=self.symbols)
+
+    def dividends(self):
+        """Long (Symbol, Date, Dividends) frame, like dividend_yield.dividends_from_panel."""
+        return self._dividends.assign(Symbol=self._dividends["Symbol"].astype(object))
+
+    def splits(self):
+        """Long (Symbol, Date, Ratio) frame of stock splits."""
+        return self._splits.assign(Symbol=self._splits["Symbol"].astype(object))
+
+    def dividends_with_prices(self, split_adjusted=True):
+        """
+        dividends() plus a Close column: the close of the last bar before each
+        ex-date, found for every payout at once with one searchsorted over
+        (symbol, day) keys. Rows are already sorted by symbol, then date.
+
+        With split_adjusted, payouts reported in pre-split shares are restated
+        per current share (see corporate_actions.split_adjusted_dividends).
+        """
+        row_codes = np.repeat(np.arange(len(self.symbols), dtype=np.int64), np.diff(self.offsets))
+        row_keys = (row_codes << 32) + self.days
+        codes = self._dividends["Symbol"].cat.codes.to_numpy().astype(np.int64)
+        payout_keys = (codes << 32) + _days(self._dividends["Date"].to_numpy())
+
+        before = np.searchsorted(row_keys, payout_keys, side="left") - 1
+        found = before >= self.offsets[codes]
+        closes = np.full(len(codes), np.nan)
+        closes[found] = self.close[before[found]]
+        dividends = self.dividends().assign(Close=closes)
+        if split_adjusted and len(self._splits):
+            dividends = split_adjusted_dividends(dividends, self.splits())
+        return dividends
+
+    def memory_usage(self):
+        """Bytes per component."""
+        usage = {
+            "symbols": self.symbols.memory_usage(deep=True),
+            "offsets": self.offsets.nbytes,
+            "days": self.days.nbytes,
+            "close": self.close.nbytes,
+            "high": self.high.nbytes,
+            "dividends": int(self._dividends.memory_usage(deep=True).sum()),
+            "splits": int(self._splits.memory_usage(deep=True).sum()),
+        }
+        if self.sectors is not None:
+            usage["sectors"] = self.sectors.memory_usage(deep=True)
+        return pd.Series(usage, name="bytes")
+
+
+def memory_report(panel, compact=None):
+    """
+    Measured bytes of a wide panel versus its compact form.
+
+    Returns a DataFrame with one row per representation and a `ratio`
+    column relative to the wide panel.
+    """
+    if compact is None:
+        compact = CompactPanel.from_panel(panel)
+    wide = int(panel.memory_usage(deep=True).sum())
+    projected = int(panel[FIELDS].memory_usage(deep=True).sum())
+    rows = {
+        "wide float64, all fields": wide,
+        "wide float64, Close/High/Dividends/Splits": projected,
+        "compact": int(compact.memory_usage().sum()),
+    }
+    report = pd.DataFrame({"bytes": rows})
+    report["MB"] = (report["bytes"] / 2**20).round(2)
+    report["ratio"] = (report["bytes"] / wide).round(3)
+    return report
@@ -0,0 +1,119 @@
+"""
+Split-adjusted dividends from the corporate actions already in each history.
+
+Yahoo's chart data carries both actions in the same response as the prices
+(the Dividends and Stock Splits columns of history() and of a download with
+actions=True), so the price cache holds them without another request per
+symbol through Ticker.dividends or Ticker.splits.
+
+Closes come back split-adjusted, and so do most dividends. For some listings,
+though, payouts from before a split arrive in pre-split shares and look N
+times too large next to the adjusted price. split_adjusted_dividends finds
+those payouts for every symbol at once and restates them per current share.
+"""
+import numpy as np
+import pandas as pd
+
+# A payout above this fraction of the prior close is taken as pre-split when
+# the symbol has no payouts after its last split to compare against
+MAX_PAYOUT_YIELD = 0.25
+# How far (as a ratio) a payout's yield may sit from F times the typical yield
+# and still count as reported in pre-split shares; narrowed to F ** 0.25 for
+# small factors so the "adjusted" and "not adjusted" bands never overlap
+TOLERANCE = 1.5
+
+
+def _days(dates):
+    return pd.DatetimeIndex(dates).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def splits_from_history(history):
+    """The non-zero `Stock Splits` rows of a history frame, as a Series of ratios."""
+    if "Stock Splits" not in history:
+        return pd.Series(dtype=float, name="Stock Splits")
+    splits = history["Stock Splits"].fillna(0)
+    return splits[splits > 0]
+
+
+def split_factors(events, splits):
+    """
+    Product of the split ratios strictly after each event, per symbol (1.0 where none).
+
+    Both frames are long (Symbol, Date, ...); splits has a Ratio column. All
+    events are looked up with two searchsorted calls over (symbol, day) keys
+    and a running sum of log ratios, instead of one pass per symbol.
+    """
+    if splits.empty or events.empty:
+        return np.ones(len(events))
+    categories = pd.Index(pd.unique(np.concatenate([events["Symbol"].astype(object), splits["Symbol"].astype(object)])))
+    split_codes = pd.Categorical(splits["Symbol"].astype(object), categories=categories).codes.astype(np.int64)
+    split_keys = (split_codes << 32) + _days(splits["Date"])
+    order = np.argsort(split_keys, kind="stable")
+    split_keys = split_keys[order]
+    log_ratios = np.log(splits["Ratio"].to_numpy(dtype=float)[order])
+    running = np.concatenate([[0.0], np.cumsum(log_ratios)])
+
+    codes = pd.Categorical(events["Symbol"].astype(object), categories=categories).codes.astype(np.int64)
+    upto = np.searchsorted(split_keys, (codes << 32) + _days(events["Date"]), side="right")
+    symbol_end = np.searchsorted(split_keys, (codes + 1) << 32, side="left")
+    return np.exp(running[symbol_end] - running[upto])
+
+
+def _lower_median(values, groups):
+    """Per row, the lower median of `values` over the rows sharing its group (NaNs ignored)."""
+    frame = pd.DataFrame({"group": groups, "value": values})
+    ranked = frame.dropna(subset=["value"]).sort_values(["group", "value"], kind="stable")
+    position = ranked.groupby("group").cumcount()
+    size = ranked.groupby("group")["value"].transform("size")
+    picked = ranked.loc[position == (size - 1) // 2].set_index("group")["value"]
+    return frame["group"].map(picked).to_numpy(dtype=float)
+
+
+def split_adjusted_dividends(dividends, splits):
+    """
+    Dividends per current share.
+
+    Yahoo's dividends are normally split-adjusted already, so a payout with
+    later splits (cumulative factor F) is only divided by F when both hold:
+
+    * its yield on the prior close is within TOLERANCE of F times the
+      symbol's typical yield (the median over its payouts with no later split),
+    * the other payouts of the same symbol and year with the same F agree:
+      the lower median of their yields, as a multiple of the typical one, is
+      also within TOLERANCE of F.
+
+    So a special dividend, which stands out from F x typical or from the
+    regular payouts of its year, is left as reported. When the symbol has no
+    payouts after its last split, MAX_PAYOUT_YIELD stands in for the typical
+    yield: the payout and its year's lower median must both exceed it, and
+    the payout divided by F must not.
+
+    Args:
+        dividends (DataFrame): Symbol, Date, Dividends and Close (the close before
+            each ex-date, e.g. CompactPanel.dividends_with_prices)
+        splits (DataFrame): Symbol, Date, Ratio
+
+    Returns:
+        A copy of dividends with Dividends restated and a Split_factor column
+        (1.0 for payouts that were left as reported).
+    """
+    factor = split_factors(dividends, splits)
+    yields = (dividends["Dividends"] / dividends["Close"]).to_numpy(dtype=float)
+    clean = np.where(factor == 1.0, yields, np.nan)
+    symbols = dividends["Symbol"].astype(object).to_numpy()
+    typical = pd.Series(clean, index=dividends.index).groupby(symbols).transform("median").to_numpy()
+    known = ~np.isnan(typical)
+    groups = pd.Series(symbols).str.cat([pd.Series(factor).astype(str),
+                                         pd.DatetimeIndex(dividends["Date"]).year.astype(str)], sep="|").to_numpy()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tolerance = np.log(np.minimum(TOLERANCE, np.exp(np.abs(np.log(factor)) / 4)))
+        # log of the yield over F x typical: 0 for a payout reported in pre-split shares
+        scale = np.log(yields / (typical * factor))
+        by_history = (np.abs(scale) <= tolerance) & (np.abs(_lower_median(scale, groups)) <= tolerance)
+        by_threshold = ((factor > 1.0) & (yields > MAX_PAYOUT_YIELD) & (yields / factor <= MAX_PAYOUT_YIELD)
+                        & (_lower_median(yields, groups) > MAX_PAYOUT_YIELD))
+    unadjusted = (factor != 1.0) & np.where(known, by_history, by_threshold)
+
+    applied = np.where(unadjusted, factor, 1.0)
+    return dividends.assign(Dividends=dividends["Dividends"].to_numpy(dtype=float) / applied, Split_factor=applied)
@@ -0,0 +1,139 @@
+"""
+Paginated, streaming investing.com dividend-calendar scraper.
+
+Pages are requested on one keep-alive requests.Session until the service
+stops offering more rows. Each page is parsed and appended to the output CSV
+as soon as it arrives, so memory stays at one page no matter how long the
+date range is. Several countries or date ranges can be pulled concurrently
+through fetch_calendars().
+"""
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from stock_div import profiling
+from stock_div.calendar_parser import parse_calendar_rows
+from stock_div.fetch_executor import shared_executor
+
+URL = "https://id.investing.com/dividends-calendar/Service/getCalendarFilteredData"
+FIELDNAMES = ["calendar_day", "company", "ticker", "ex_date", "dividend", "dividend_type", "payment_date", "yield_percent"]
+# investing.com country ids -> file name prefix
+COUNTRY_PREFIXES = {48: "id", 36: "sg"}
+# investing.com country ids -> Yahoo Finance ticker suffix
+YAHOO_SUFFIXES = {48: ".JK", 36: ".SI"}
+# Browser-like headers the service expects; add a "Cookie" entry when it starts refusing requests
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:147.0) Gecko/20100101 Firefox/147.0",
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Content-Type": "application/x-www-form-urlencoded",
+    "X-Requested-With": "XMLHttpRequest",
+    "Origin": "https://id.investing.com",
+    "Referer": "https://id.investing.com/dividends-calendar/",
+    "DNT": "1",
+    "Connection": "keep-alive",
+}
+MAX_PAGES = 500
+
+
+def make_session(headers, pool_size=8):
+    """Keep-alive session with a connection pool big enough for concurrent pulls."""
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def iter_pages(session, payload, url=URL, executor=None):
+    """
+    Yields every JSON page for one payload, following the service's
+    limit_from / last_time_scope paging until bind_scroll_handler is off.
+    """
+    executor = executor or shared_executor()
+    payload = dict(payload, limit_from=0)
+    for _ in range(MAX_PAGES):
+        def post():
+            with profiling.timed("calendar_page"):
+                response = session.post(url, data=payload, timeout=executor.timeout)
+                response.raise_for_status()
+                return response.json()
+
+        page = executor.call(post)
+        yield page
+        if not page.get('bind_scroll_handler') or not page.get('data', '').strip():
+            return
+        payload['limit_from'] += 1
+        if page.get('last_time_scope'):
+            payload['last_time_scope'] = page['last_time_scope']
+
+
+def output_filename(payload, page):
+    country = payload.get('country[]')
+    prefix = COUNTRY_PREFIXES.get(country, f"country{country}")
+    return f"{prefix}_dividends_{page.get('dateFrom')}_to_{page.get('dateTo')}.csv"
+
+
+def stream_calendar_to_csv(session, payload, url=URL, out_dir=".", executor=None, preview_rows=5):
+    """
+    Pulls every page for one payload and appends parsed rows to a CSV as they arrive.
+
+    Returns (filepath, row_count, preview) where preview holds the first few rows.
+    filepath is None when the calendar had no rows.
+    """
+    filepath = None
+    f = writer = None
+    row_count = 0
+    preview = []
+    current_day = None
+    try:
+        for page in iter_pages(session, payload, url, executor):
+            rows, current_day = parse_calendar_rows(page.get('data', ''), current_day)
+            if not rows:
+                continue
+            if writer is None:
+                filepath = os.path.join(out_dir, output_filename(payload, page))
+                f = open(filepath, 'w', newline='', encoding='utf-8')
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            row_count += len(rows)
+            preview.extend(rows[:preview_rows - len(preview)])
+    finally:
+        if f is not None:
+            f.close()
+    return filepath, row_count, preview
+
+
+def fetch_calendar_rows(session, payload, url=URL, executor=None):
+    """Every parsed row for one payload, in memory; for short ranges such as a week."""
+    rows = []
+    current_day = None
+    for page in iter_pages(session, payload, url, executor):
+        page_rows, current_day = parse_calendar_rows(page.get('data', ''), current_day)
+        rows.extend(page_rows)
+    return rows
+
+
+def fetch_calendars(session, payloads, url=URL, out_dir=".", executor=None):
+    """
+    Streams several payloads (countries or date ranges) concurrently on one session.
+
+    Returns a list of (filepath, row_count, preview) in payload order; a payload
+    that failed maps to the raised exception instead.
+    """
+    executor = executor or shared_executor()
+    with ThreadPoolExecutor(max_workers=max(1, len(payloads))) as pool:
+        jobs = [pool.submit(stream_calendar_to_csv, session, payload, url, out_dir, executor) for payload in payloads]
+        results = []
+        for job in jobs:
+            try:
+                results.append(job.result())
+            except Exception as e:
+                results.append(e)
+    return results
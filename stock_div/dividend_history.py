@@ -0,0 +1,120 @@
+"""
+Annual dividend history for a single ticker.
+
+Used by ticker_dividend.py and by `python -m stock_div dividend`.
+"""
+import threading
+
+import pandas as pd
+
+from stock_div import profiling
+from stock_div.backend import market
+from stock_div.corporate_actions import split_adjusted_dividends, splits_from_history
+from stock_div.lookup_cache import LookupCache
+from stock_div.storage import export_csv, write_partition
+
+
+def fetch_annual_dividends(symbol):
+    """
+    Fetches all dividend history for a symbol and sums it by year, with
+    the yield based on the current price and on the price at each payout.
+    Payouts reported in pre-split shares are restated per current share,
+    from the splits in the same response. Nothing is written to disk.
+
+    Returns (annual_df, hist, currency), or None if the symbol has no
+    price or no dividends. hist holds the latest bar only.
+    """
+    ticker = market().Ticker(symbol)
+
+    # 1. One request for prices and dividends. Unadjusted closes, so the
+    # yield at payment uses the price investors actually paid
+    with profiling.timed("history", symbol):
+        full = ticker.history(period="max", auto_adjust=False)
+    if full.empty:
+        print(f"Could not fetch price for {symbol}")
+        return None
+    hist = full.iloc[-1:]
+    current_price = hist['Close'].iloc[-1]
+    # Filled in by the history call above, so the currency costs no extra request
+    currency = (getattr(ticker, "history_metadata", None) or {}).get("currency", "")
+
+    # 2. Get dividends
+    divs = full.loc[full['Dividends'] > 0, 'Dividends']
+    if divs.empty:
+        print(f"No dividend history found for {symbol}")
+        return None
+
+    # 3. Process data into a DataFrame, each payout next to the last close before its ex-date
+    df = divs.rename_axis('Date').to_frame().reset_index()
+    closes = full['Close'].rename_axis('Date').reset_index()
+    df = pd.merge_asof(df, closes, on='Date', allow_exact_matches=False)
+    splits = splits_from_history(full).rename_axis('Date').rename('Ratio').reset_index()
+    df = split_adjusted_dividends(df.assign(Symbol=symbol), splits.assign(Symbol=symbol))
+    df['Year'] = df['Date'].dt.year
+    df['Yield_at_payment_%'] = df['Dividends'] / df['Close'] * 100
+
+    # 4. Group by year and sum (combines multiple payouts)
+    annual_df = df.groupby('Year')[['Dividends', 'Yield_at_payment_%']].sum(min_count=1).reset_index()
+
+    # 5. Calculate yield % based on current price
+    annual_df.insert(2, 'Yield_%', (annual_df['Dividends'] / current_price) * 100)
+    return annual_df, hist, currency
+
+
+_lookups = None
+_lookups_lock = threading.Lock()
+
+
+def dividend_lookups():
+    """Process-wide LRU of fetch_annual_dividends results, shared across marimo reruns."""
+    global _lookups
+    with _lookups_lock:
+        if _lookups is None:
+            _lookups = LookupCache(fetch_annual_dividends, name="dividend_lookups")
+        return _lookups
+
+
+def save_annual_dividend_history(symbol, save_csv=True, lookups=None):
+    """
+    Fetches all dividend history for a symbol, sums by year,
+    calculates yield based on current price, and saves to the
+    annual_dividends Parquet dataset (and to CSV if save_csv).
+
+    Pass a LookupCache (e.g. dividend_lookups()) to reuse recent fetches.
+
+    Returns (annual_df, hist, currency), or (None, None, None) on failure.
+    """
+    try:
+        with profiling.stage("dividends.fetch"):
+            fetched = lookups.get(symbol) if lookups is not None else fetch_annual_dividends(symbol)
+        if fetched is None:
+            return None, None, None
+        annual_df, hist, currency = fetched
+        annual_df = annual_df.copy()
+        current_price = hist['Close'].iloc[-1]
+
+        # Unformatted numbers go to Parquet, one file per symbol and year
+        with profiling.stage("dividends.write"):
+            write_partition(annual_df.assign(Symbol=symbol), "annual_dividends", "custom", key=symbol, year_col="Year")
+
+        # 6. Formatting: If Payout > 1000, remove decimals
+        def format_payout(val):
+            if val > 1000:
+                return int(round(val))
+            return round(val, 2)
+
+        annual_df['Dividends'] = annual_df['Dividends'].apply(format_payout)
+        annual_df['Yield_%'] = annual_df['Yield_%'].map('{:.2f}'.format)
+        annual_df['Yield_at_payment_%'] = annual_df['Yield_at_payment_%'].map('{:.2f}'.format)
+
+        # 7. Optional CSV copy
+        if save_csv:
+            filename = export_csv(annual_df, f"{symbol.replace('.', '_')}_annual_dividends.csv")
+            print(f"✅ Success! File saved as: {filename}")
+        else:
+            print(f"✅ Success! Saved {symbol} to the annual_dividends dataset")
+        print(f"Current Price used: {current_price:.2f}")
+        return annual_df, hist, currency
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None, None, None
@@ -0,0 +1,77 @@
+"""
+Vectorized period highs and drawdowns over a whole price panel.
+
+A panel here is a wide frame with one column per symbol, e.g. panel["High"]
+from fetch_universe. Period highs for every window come from one reverse
+running max, and the full drawdown history is available as a frame so
+charts and screens do not need to recompute it.
+"""
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+WINDOWS = {"1y": 1, "2y": 2, "5y": 5, "10y": 10}
+
+
+def period_highs(high_panel, windows=WINDOWS, as_of=None):
+    """
+    Highest price per symbol since `as_of - 365*N days` for every window.
+
+    Args:
+        high_panel (DataFrame): dates x symbols, usually panel["High"]
+        windows (dict): label -> length in years
+        as_of (datetime, optional): end of every window, defaults to today
+
+    Returns:
+        DataFrame indexed by symbol with one column per window label.
+    """
+    as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.now()
+    # Row i holds the max from date i to the end, so a window high is one row lookup.
+    # The bfill covers symbols with no bar on that date (holidays, not yet listed).
+    highs_since = high_panel.iloc[::-1].cummax().iloc[::-1].bfill()
+
+    columns = {}
+    for label, years in windows.items():
+        cutoff = as_of - timedelta(days=365 * years)
+        start = highs_since.index.searchsorted(cutoff)
+        if start < len(highs_since):
+            columns[label] = highs_since.iloc[start]
+        else:
+            columns[label] = pd.Series(np.nan, index=high_panel.columns)
+    return pd.DataFrame(columns)
+
+
+def drawdown_pct(latest_prices, highs):
+    """
+    Distance from each high in percent, e.g. -12.5 for 12.5% below the high.
+
+    Args:
+        latest_prices (Series): latest price indexed by symbol
+        highs (DataFrame): symbol x window highs from period_highs
+
+    Returns:
+        DataFrame shaped like highs, rounded to 2 decimals. Missing or
+        non-positive highs give NaN.
+    """
+    highs = highs.where(highs > 0)
+    prices = latest_prices.reindex(highs.index).to_numpy()
+    return highs.rsub(prices, axis=0).div(highs).mul(100).round(2)
+
+
+def rolling_drawdown(close_panel, high_panel=None, window=None):
+    """
+    Full drawdown time series in percent for every symbol.
+
+    Args:
+        close_panel (DataFrame): dates x symbols closing prices
+        high_panel (DataFrame, optional): dates x symbols highs, defaults to closes
+        window (int, optional): trailing window in trading days; None measures
+            from the running all-time high within the panel
+    """
+    highs = close_panel if high_panel is None else high_panel
+    if window is None:
+        running_high = highs.cummax()
+    else:
+        running_high = highs.rolling(window, min_periods=1).max()
+    return (close_panel / running_high - 1) * 100
@@ -0,0 +1,274 @@
+"""
+Shared thread-pool executor for network fetches.
+
+Every call goes through a token-bucket rate limiter and is retried with
+jittered exponential backoff. A call that makes several HTTP requests (a
+threaded multi-symbol download) is charged one token per request. The
+timeout is handed to the fetch functions, which set it on the HTTP request
+itself where they can (download, the calendar post), so a hung request ends
+on its own. Calls that take no timeout (Ticker.info, fast_info) go through
+with_deadline, which gives the pool thread back when the timeout passes.
+One executor can be shared by several concurrent fetch jobs so their
+I/O overlaps while the combined request rate stays under the cap.
+
+A circuit breaker sits in front of the limiter: when Yahoo starts throttling
+(a rate-limit error, or a run of consecutive failures) every worker pauses
+together, one probe request tests the water after the cooldown, and the
+cooldown doubles each time the probe fails. After MAX_TRIPS failed probes
+calls fail fast with CircuitOpenError instead of hammering a dead upstream.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tqdm import tqdm
+
+from stock_div import profiling
+
+MAX_WORKERS = 8
+RATE_PER_SECOND = 4.0
+BURST = 8
+TIMEOUT = 30
+RETRIES = 3
+BACKOFF = 1.0
+# Circuit breaker: consecutive failures that trip it, first pause, longest pause, trips before giving up
+FAILURE_THRESHOLD = 5
+COOLDOWN = 30.0
+MAX_COOLDOWN = 600.0
+MAX_TRIPS = 6
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of a request once the upstream has failed every probe."""
+
+
+class ThrottledError(RuntimeError):
+    """
+    Raised by a fetch function whose response looks throttled although no
+    error reached it, e.g. a multi-symbol download that came back all empty
+    because yfinance swallowed every per-ticker rate-limit error.
+    """
+
+
+def is_throttled(error):
+    """True for errors that mean "slow down" rather than "this symbol is broken"."""
+    if isinstance(error, ThrottledError):
+        return True
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return "RateLimit" in type(error).__name__ or "Too Many Requests" in str(error)
+
+
+def with_deadline(fn, timeout, *args):
+    """
+    Run fn(*args) on a daemon thread and return its result, or raise TimeoutError
+    after `timeout` seconds. The abandoned call finishes on its own thread; a run
+    of timeouts opens the circuit breaker, so few of them pile up.
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = fn(*args)
+        except Exception as e:
+            outcome["error"] = e
+
+    worker = threading.Thread(target=target, name="fetch-deadline", daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"no response within {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked."""
+
+    def __init__(self, rate=RATE_PER_SECOND, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, n=1):
+        """
+        Block until n tokens are available, then take them.
+
+        A charge larger than the burst waits for a full bucket and leaves it
+        in debt, so the callers after it wait out the excess.
+        """
+        needed = min(n, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= n
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Shared pause switch for all workers: closed -> open (cooldown) -> half-open
+    (one probe) -> closed on success, or open again with the cooldown doubled.
+
+    Args:
+        threshold (int): consecutive failures that open the circuit; a throttling error opens it at once
+        cooldown (float): seconds of the first pause
+        max_cooldown (float): cap on the doubled pause
+        max_trips (int): consecutive openings after which before() raises CircuitOpenError
+    """
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, max_cooldown=MAX_COOLDOWN, max_trips=MAX_TRIPS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_trips = max_trips
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.opened_until = 0.0
+        self._probing = False
+        self._changed = threading.Condition()
+
+    def before(self):
+        """Block while the circuit is open; in half-open state let a single probe through."""
+        with self._changed:
+            while True:
+                if self.state == "closed":
+                    return
+                now = time.monotonic()
+                if self.state == "open" and now >= self.opened_until:
+                    self.state = "half-open"
+                    self._probing = False
+                if self.state == "half-open" and not self._probing:
+                    self._probing = True
+                    return
+                if self.trips > self.max_trips:
+                    # Given up: fail fast until the next probe is due
+                    raise CircuitOpenError(f"upstream still failing after {self.max_trips} pauses")
+                self._changed.wait(timeout=max(self.opened_until - now, 0.1) if self.state == "open" else None)
+
+    def success(self):
+        with self._changed:
+            if self.state == "open":
+                # Sent before the circuit opened; only the probe may close it
+                return
+            if self.state == "half-open":
+                print("✅ Upstream recovered, resuming")
+            self.state = "closed"
+            self.failures = 0
+            self.trips = 0
+            self._probing = False
+            self._changed.notify_all()
+
+    def failure(self, error):
+        with self._changed:
+            self.failures += 1
+            if self.state == "open":
+                # A request that was already in flight; the pause is running
+                return
+            if self.state == "half-open" or is_throttled(error) or self.failures >= self.threshold:
+                pause = min(self.cooldown * 2 ** self.trips, self.max_cooldown)
+                self.trips += 1
+                self.state = "open"
+                self.opened_until = time.monotonic() + pause
+                self._probing = False
+                profiling.count("circuit_breaker.trips")
+                print(f"⚠️ Upstream failing ({type(error).__name__}: {error}); pausing all fetches for {pause:.0f}s")
+                self._changed.notify_all()
+
+
+class FetchExecutor:
+    """
+    Runs fetch functions concurrently with a concurrency cap, rate limit,
+    timeout and retries.
+
+    Args:
+        max_workers (int): maximum number of fetches in flight
+        rate (float): requests per second allowed by the token bucket
+        burst (int): requests that may be issued back to back
+        timeout (float): per-request timeout; fetch functions pass executor.timeout to their HTTP calls,
+            or to with_deadline when the call takes none
+        retries (int): extra attempts after the first failure
+        backoff (float): base delay in seconds, doubled per attempt and jittered
+        breaker (CircuitBreaker, optional): shared pause switch; defaults to a new one
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, rate=RATE_PER_SECOND, burst=BURST,
+                 timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF, breaker=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = TokenBucket(rate, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self._workers = ThreadPoolExecutor(max_workers, thread_name_prefix="fetch")
+
+    def call(self, fn, *args, cost=1):
+        """
+        Run fn(*args) under the circuit breaker, rate limit and retries, and return its result.
+
+        Args:
+            cost (int): HTTP requests fn makes, e.g. the symbol count of a threaded download
+        """
+        for attempt in range(self.retries + 1):
+            self.breaker.before()
+            self.limiter.acquire(cost)
+            profiling.count("requests", cost)
+            try:
+                result = fn(*args)
+            except Exception as e:
+                self.breaker.failure(e)
+                if attempt == self.retries:
+                    profiling.count("request_failures")
+                    raise
+                profiling.count("retries")
+                time.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+            else:
+                self.breaker.success()
+                return result
+
+    def map(self, fn, items, desc=None, cost=None):
+        """
+        Apply fn to every item concurrently.
+
+        Returns a dict of item -> result in input order. Items that still fail
+        after all retries map to the raised exception instead of a result.
+
+        Args:
+            cost (callable, optional): item -> HTTP requests fn(item) makes, e.g. len for batches
+        """
+        items = list(items)
+        futures = {self._workers.submit(self.call, fn, item, cost=cost(item) if cost else 1): item for item in items}
+        results = {}
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc, disable=desc is None):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = e
+        return {item: results[item] for item in items}
+
+    def shutdown(self):
+        self._workers.shutdown(wait=True)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_executor():
+    """Process-wide executor, so separate fetch jobs share one rate limit."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = FetchExecutor()
+        return _shared
@@ -0,0 +1,159 @@
+"""
+TTL cache of projected Yahoo Finance metadata fields.
+
+Only the fields a caller needs are kept, each with its own time-to-live:
+names and sectors rarely change, market cap changes daily. A refresh asks
+Yahoo only for symbols that have an expired field, and when the only
+expired field is the market cap it uses the lighter fast_info endpoint
+instead of the full `info` payload.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from stock_div import profiling
+from stock_div.backend import market
+from stock_div.fetch_executor import shared_executor, with_deadline
+
+CACHE_FILE = "./data/cache/info.json"
+FIELD_TTLS = {
+    "shortName": timedelta(days=30),
+    "sector": timedelta(days=30),
+    "marketCap": timedelta(days=1),
+}
+# Fields fast_info can refresh without downloading the whole info payload
+FAST_FIELDS = {"marketCap"}
+# Fetched symbols written to the cache file at a time, so an interrupted run keeps its progress
+CHECKPOINT_EVERY = 25
+
+_file_lock = threading.Lock()
+
+
+class InfoCache:
+    """
+    Per-field cached metadata, persisted as JSON:
+    {symbol: {field: {"value": ..., "fetched_at": iso timestamp}}}.
+    """
+
+    def __init__(self, path=CACHE_FILE, field_ttls=FIELD_TTLS):
+        self.path = path
+        self.field_ttls = field_ttls
+        self.entries = self._read()
+        self._dirty = set()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def expired_fields(self, symbol, fields, now=None):
+        now = now or datetime.now()
+        cached = self.entries.get(symbol, {})
+        expired = set()
+        for field in fields:
+            entry = cached.get(field)
+            ttl = self.field_ttls.get(field, timedelta(0))
+            if entry is None or now - datetime.fromisoformat(entry["fetched_at"]) > ttl:
+                expired.add(field)
+        return expired
+
+    def values(self, symbol, fields):
+        """Cached values for the requested fields; missing or None values are left out."""
+        cached = self.entries.get(symbol, {})
+        return {f: cached[f]["value"] for f in fields if f in cached and cached[f]["value"] is not None}
+
+    def update(self, symbol, values, now=None):
+        stamp = (now or datetime.now()).isoformat()
+        entry = self.entries.setdefault(symbol, {})
+        for field, value in values.items():
+            entry[field] = {"value": value, "fetched_at": stamp}
+        self._dirty.add(symbol)
+
+    def save(self):
+        """Merge this instance's updates into the file, so concurrent runs don't drop each other's."""
+        if not self._dirty:
+            return
+        with _file_lock:
+            on_disk = self._read()
+            for symbol in self._dirty:
+                on_disk.setdefault(symbol, {}).update(self.entries[symbol])
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(on_disk, f)
+            os.replace(tmp_path, self.path)
+            self.entries = on_disk
+        self._dirty.clear()
+
+
+def _fetch_fields(symbol, fields, timeout):
+    # Neither property takes a timeout, so the deadline is enforced around it
+    ticker = market().Ticker(symbol)
+
+    def fast_fields():
+        # fast_info is lazy: the item lookups are what send the requests
+        fast = ticker.fast_info
+        return {field: fast[field] for field in fields}
+
+    if fields <= FAST_FIELDS:
+        with profiling.timed("fast_info", symbol):
+            return with_deadline(fast_fields, timeout)
+    with profiling.timed("info", symbol):
+        info = with_deadline(lambda: ticker.info, timeout)
+    return {field: info.get(field) for field in fields}
+
+
+def fetch_info(symbols, fields=tuple(FIELD_TTLS), cache=None, executor=None):
+    """
+    Returns {symbol: {field: value}} for the requested fields, fetching only expired ones.
+
+    A symbol whose refresh fails falls back to its stale cached values; it maps
+    to the raised exception only when nothing was ever cached for it. Fetched
+    values are saved every CHECKPOINT_EVERY symbols, so a rerun after a crash
+    only asks for the rest.
+
+    Args:
+        symbols (iterable): Yahoo Finance tickers
+        fields (iterable): info keys to project, e.g. ("shortName", "sector", "marketCap")
+        cache (InfoCache, optional): defaults to ./data/cache/info.json
+        executor (FetchExecutor, optional): defaults to the process-wide shared executor
+    """
+    symbols = list(symbols)
+    fields = tuple(fields)
+    cache = cache or InfoCache()
+    expired = {symbol: cache.expired_fields(symbol, fields) for symbol in symbols}
+    to_fetch = [symbol for symbol in symbols if expired[symbol]]
+
+    executor = executor or shared_executor()
+    lock = threading.Lock()
+
+    def fetch_and_checkpoint(symbol):
+        values = _fetch_fields(symbol, expired[symbol], executor.timeout)
+        with lock:
+            if values:
+                cache.update(symbol, values)
+            if len(cache._dirty) >= CHECKPOINT_EVERY:
+                cache.save()
+        return values
+
+    fetched = {}
+    if to_fetch:
+        fetched = executor.map(fetch_and_checkpoint, to_fetch, desc="Fetching tickers")
+    print(f"Info cache: {len(symbols) - len(to_fetch)} hits, {len(to_fetch)} refreshed")
+    profiling.count("info_cache.hits", len(symbols) - len(to_fetch))
+    profiling.count("info_cache.misses", len(to_fetch))
+
+    results = {}
+    for symbol in symbols:
+        values = fetched.get(symbol)
+        if isinstance(values, Exception):
+            results[symbol] = cache.values(symbol, fields) if symbol in cache.entries else values
+            continue
+        results[symbol] = cache.values(symbol, fields)
+    cache.save()
+    return results
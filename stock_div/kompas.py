@@ -0,0 +1,92 @@
+"""
+The Kompas100 dividend analysis pipeline, without any UI dependencies.
+
+Used by the "Run" cell of kompas100.py and by `python -m stock_div kompas100`.
+"""
+import pandas as pd
+
+from stock_div import profiling
+from stock_div.compact_panel import CompactPanel
+from stock_div.dividend_yield import avg_annual_yields, avg_yields_at_payment
+from stock_div.drawdown import WINDOWS, drawdown_pct
+from stock_div.price_cache import fetch_universe
+from stock_div.ranking import DEFAULT_CRITERIA, rank
+from stock_div.report import FORMATS, build_sections, write_reports
+
+REPORT_FILE = "dividend_report_final.txt"
+
+
+def ellipsize_name(name, max_len=12):
+    if len(name) > max_len:
+        return name[:max_len - 1] + '…'
+    return name
+
+
+def analyze_universe(universe, as_of, horizons=(2, 5, 10), executor=None, panel=None):
+    """
+    Fetches (or reads from cache) the whole universe and computes prices,
+    drawdowns and average dividend yields for every stock, both on today's
+    price (avg_{N}y) and on the price at each payout (avg_{N}y_at_payment).
+
+    Args:
+        universe (dict): display name -> Yahoo ticker, e.g. universes.stocks
+        as_of (datetime): tz-naive end of every horizon and window
+        horizons (tuple): yield horizons in years
+        executor (FetchExecutor, optional): defaults to the process-wide shared executor
+        panel (CompactPanel or DataFrame, optional): an already fetched fetch_universe panel to reuse
+
+    Returns:
+        DataFrame with one row per stock that has price history.
+    """
+    with profiling.stage("analyze.fetch"):
+        if panel is None:
+            print(f'Fetching {len(universe)} symbols in batches...')
+            panel = fetch_universe(universe.values(), executor=executor, compact=True)
+        elif not isinstance(panel, CompactPanel):
+            panel = CompactPanel.from_panel(panel)
+    latest_prices = panel.latest_prices()
+
+    # Every horizon and every window for every symbol in one vectorized pass each
+    with profiling.stage("analyze.dividends"):
+        dividends = panel.dividends_with_prices()
+    with profiling.stage("analyze.yields"):
+        yields = avg_annual_yields(dividends, latest_prices, horizons, as_of)
+        yields = yields.join(avg_yields_at_payment(dividends, latest_prices.index, horizons, as_of))
+    with profiling.stage("analyze.drawdowns"):
+        drawdowns = drawdown_pct(latest_prices, panel.period_highs(WINDOWS, as_of))
+
+    with profiling.stage("analyze.table"):
+        results_list = []
+        for name, symbol in universe.items():
+            if symbol not in latest_prices.index or pd.isna(latest_prices[symbol]):
+                print(f'Error {symbol}: no price history')
+                continue
+            dd = drawdowns.loc[symbol]
+            results_list.append({'name': ellipsize_name(name), 'symbol': symbol, 'latest_price': round(latest_prices[symbol], 2), 'high_1y_pct': dd['1y'],
+                                 'ath_pct': dd['10y'], 'drawdown_2y': dd['2y'], 'drawdown_5y': dd['5y'], 'drawdown_10y': dd['10y'], **yields.loc[symbol].to_dict()})
+        return pd.DataFrame(results_list)
+
+
+def top_lists(df_results, n=20, rule="intersection"):
+    """
+    Returns (top_2y, top_5y, top_10y, triple_overlap) for the given results.
+
+    See stock_div.ranking for other metrics, weights and rules.
+    """
+    with profiling.stage("rank"):
+        tables, triple_overlap = rank(df_results, n, DEFAULT_CRITERIA, rule)
+    return tables["2y"], tables["5y"], tables["10y"], triple_overlap
+
+
+def write_report(as_of, top_2y, top_5y, top_10y, triple_overlap, path=REPORT_FILE, formats=FORMATS,
+                 n=20, rule="intersection"):
+    """
+    Writes the report in every requested format next to `path`
+    (dividend_report_final.txt, .md, .html, .json by default); `n` and
+    `rule` are the top_lists arguments, for the section titles.
+    """
+    with profiling.stage("report.write"):
+        sections = build_sections(top_2y, top_5y, top_10y, triple_overlap, n, rule)
+        paths = write_reports(sections, as_of, path, formats)
+    print(f'\n--- Final report saved to {", ".join(paths)} ---')
+    return paths
@@ -0,0 +1,106 @@
+"""
+Bounded, thread-safe LRU cache for per-symbol lookups.
+
+Lives at module level, so it survives marimo cell reruns for the whole
+session. Concurrent requests for the same symbol (e.g. a search racing a
+background prefetch) share one load instead of fetching twice. Symbols are
+keyed as typed in upper case ("bbca.jk" and "BBCA.JK" are one entry), and a
+failed lookup is remembered briefly so a bad watchlist symbol is not
+refetched on every rerun.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from stock_div import profiling
+
+MAXSIZE = 128
+TTL = timedelta(minutes=15)
+# How long a failed lookup (a None result) is served from the cache
+NEGATIVE_TTL = timedelta(minutes=2)
+
+
+def normalize(symbol):
+    return symbol.strip().upper()
+
+
+class LookupCache:
+    """
+    Maps symbol -> loader(symbol), keeping at most `maxsize` entries younger than `ttl`.
+
+    Keys go through normalize() and the loader gets the normalized symbol.
+    A loader result of None (a failed lookup) is cached for `negative_ttl`
+    only; a loader exception is not cached at all. `name` prefixes the
+    hit/miss counters in stock_div.profiling.
+    """
+
+    def __init__(self, loader, maxsize=MAXSIZE, ttl=TTL, prefetch_workers=4, name="lookup_cache",
+                 negative_ttl=NEGATIVE_TTL):
+        self.loader = loader
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._prefetch = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="prefetch")
+
+    def _fresh(self, symbol):
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return None
+        value, loaded_at = entry
+        if datetime.now() - loaded_at > (self.ttl if value is not None else self.negative_ttl):
+            del self._entries[symbol]
+            return None
+        self._entries.move_to_end(symbol)
+        return entry
+
+    def cached(self, symbol):
+        """True when get(symbol) would return without a network call."""
+        with self._lock:
+            return self._fresh(normalize(symbol)) is not None
+
+    def get(self, symbol):
+        symbol = normalize(symbol)
+        with self._lock:
+            entry = self._fresh(symbol)
+            if entry is not None:
+                profiling.count(f"{self.name}.hits")
+                return entry[0]
+            future = self._pending.get(symbol)
+            owner = future is None
+            if owner:
+                future = self._pending[symbol] = Future()
+        profiling.count(f"{self.name}.misses" if owner else f"{self.name}.shared")
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = self.loader(symbol)
+        except Exception as e:
+            with self._lock:
+                del self._pending[symbol]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[symbol]
+            self._entries[symbol] = (value, datetime.now())
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def prefetch(self, symbols):
+        """Loads the given symbols in background threads; returns immediately."""
+        for symbol in dict.fromkeys(map(normalize, symbols)):
+            if not self.cached(symbol):
+                self._prefetch.submit(self.get, symbol)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,292 @@
+"""
+On-disk cache of raw Yahoo Finance price history and dividends, keyed by symbol.
+
+The first fetch of a symbol downloads the full window. Later fetches only ask
+Yahoo for the rows after the last cached date and merge them in. Indexes are
+stored as exchange-local, tz-naive dates so IDX and SGX symbols can share one
+panel.
+"""
+import os
+import pickle
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from stock_div import profiling
+from stock_div.backend import market
+from stock_div.compact_panel import CompactPanel
+from stock_div.corporate_actions import splits_from_history
+from stock_div.fetch_executor import ThrottledError, shared_executor
+from stock_div.sector_index import sector_index
+
+CACHE_DIR = "./data/cache"
+MAX_AGE = timedelta(hours=6)
+BATCH_SIZE = 50
+PANEL_FIELDS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+
+def _cache_path(symbol, cache_dir):
+    return os.path.join(cache_dir, f"{symbol.replace('.', '_')}.pkl")
+
+
+def load_cached(symbol, cache_dir=CACHE_DIR):
+    """Return the cached entry for a symbol, or None if it was never fetched."""
+    path = _cache_path(symbol, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def save_cached(symbol, entry, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(symbol, cache_dir)
+    # Per-thread temp name, so two writers of one symbol never share a temp file
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(entry, f)
+    os.replace(tmp_path, path)
+
+
+def _naive(data):
+    if getattr(data.index, "tz", None) is not None:
+        data = data.copy()
+        data.index = data.index.tz_localize(None)
+    return data
+
+
+def merge_rows(cached, fresh):
+    """Append fresh rows to a cached frame, letting fresh rows win on overlap."""
+    combined = pd.concat([cached, fresh])
+    combined = combined[~combined.index.duplicated(keep="last")]
+    return combined.sort_index()
+
+
+def _has_new_action(history, fresh):
+    # Yahoo back-adjusts older closes on a new dividend or split,
+    # so the cached prices are stale and the window must be refetched whole
+    new_rows = fresh[fresh.index > history.index[-1]]
+    actions = new_rows.reindex(columns=["Dividends", "Stock Splits"]).fillna(0)
+    return bool(actions.to_numpy().any())
+
+
+def _is_stale(entry, max_age):
+    return entry is None or entry["history"].empty or datetime.now() - entry["fetched_at"] > max_age
+
+
+def _trim(history, years):
+    if history.empty:
+        return history
+    window_start = history.index[-1] - pd.DateOffset(years=years)
+    return history[history.index >= window_start]
+
+
+def _full_fetch(tkr, years, previous=None):
+    # history() carries the Dividends and Stock Splits columns, so no separate actions request
+    with profiling.timed("history", tkr.ticker):
+        return _entry_from_history(_naive(tkr.history(period=f"{years}y")), previous)
+
+
+def fetch_symbol(symbol, years=10, cache_dir=CACHE_DIR, max_age=MAX_AGE):
+    """
+    Returns (history, dividends) for a symbol, going to Yahoo only for the
+    rows after the last cached date.
+
+    Args:
+        symbol (str): Yahoo Finance ticker, e.g. "BBCA.JK"
+        years (int): length of the history window to keep
+        cache_dir (str): folder holding one pickle per symbol
+        max_age (timedelta): entries younger than this are served without any request
+    """
+    entry = load_cached(symbol, cache_dir)
+
+    if entry is None or entry["history"].empty:
+        profiling.count("price_cache.misses")
+        entry = _full_fetch(market().Ticker(symbol), years)
+        save_cached(symbol, entry, cache_dir)
+    elif _is_stale(entry, max_age):
+        profiling.count("price_cache.stale")
+        tkr = market().Ticker(symbol)
+        history = entry["history"]
+
+        # Start at the last cached day so a partial intraday bar gets replaced
+        with profiling.timed("history", symbol):
+            fresh = _naive(tkr.history(start=history.index[-1].strftime("%Y-%m-%d")))
+
+        # An empty response is a failed update (the start day itself should come back),
+        # so the entry keeps its old fetched_at and the next call tries again
+        if not fresh.empty:
+            if _has_new_action(history, fresh):
+                profiling.count("price_cache.refetches")
+                entry = _full_fetch(tkr, years, entry)
+            else:
+                entry = _entry_from_history(merge_rows(history, fresh), entry)
+            save_cached(symbol, entry, cache_dir)
+    else:
+        profiling.count("price_cache.hits")
+
+    return _trim(entry["history"], years), entry["dividends"]
+
+
+def _batches(symbols, batch_size):
+    # Tuples, so batches can key the executor's result dict
+    return [tuple(symbols[i:i + batch_size]) for i in range(0, len(symbols), batch_size)]
+
+
+def _download(batch, timeout, **kwargs):
+    """
+    One multi-symbol request, split back into per-symbol frames.
+
+    yfinance catches each ticker's error (a rate limit included) and leaves
+    that ticker empty, so the result only holds symbols with rows. When no
+    symbol of the batch has any, the batch raises: ThrottledError for several
+    symbols, so the circuit breaker sees the throttling, and RuntimeError for
+    one, which may just be delisted.
+    """
+    with profiling.timed("download", f"{batch[0]}..{batch[-1]} ({len(batch)})"):
+        data = market().download(
+            batch, group_by="ticker", actions=True, auto_adjust=True,
+            threads=True, progress=False, timeout=timeout, **kwargs
+        )
+    frames = {}
+    downloaded = set(data.columns.get_level_values(0)) if not data.empty else set()
+    for symbol in batch:
+        if symbol in downloaded:
+            frame = data[symbol].dropna(subset=["Close"])
+            if not frame.empty:
+                frames[symbol] = _naive(frame)
+    profiling.count("price_cache.empty", len(batch) - len(frames))
+    if not frames:
+        error = ThrottledError if len(batch) > 1 else RuntimeError
+        raise error(f"download returned no rows for any of {len(batch)} symbols")
+    return frames
+
+
+def _older_actions(previous, key, history):
+    # Actions cached from before the window of a refetched history
+    older = previous.get(key) if previous else None
+    if older is None or older.empty or history.empty:
+        return None
+    older = _naive(older)
+    return older[older.index < history.index[0]]
+
+
+def _entry_from_history(history, previous=None):
+    """
+    A cache entry whose dividends and splits come from the history's action columns.
+
+    Payouts and splits in `previous` dated before the history's first row are
+    kept, so refetching a `years` window never shortens the dividend series
+    that was already cached (e.g. from an older, longer fetch).
+    """
+    divs = history["Dividends"]
+    dividends, splits = divs[divs > 0], splits_from_history(history)
+    older_dividends = _older_actions(previous, "dividends", history)
+    older_splits = _older_actions(previous, "splits", history)
+    if older_dividends is not None and len(older_dividends):
+        dividends = pd.concat([older_dividends, dividends]).rename(dividends.name)
+    if older_splits is not None and len(older_splits):
+        splits = pd.concat([older_splits, splits]).rename(splits.name)
+    return {
+        "history": history,
+        "dividends": dividends,
+        "splits": splits,
+        "fetched_at": datetime.now(),
+    }
+
+
+def fetch_universe(symbols, years=10, batch_size=BATCH_SIZE, cache_dir=CACHE_DIR, max_age=MAX_AGE,
+                   executor=None, compact=False, refetch=()):
+    """
+    Returns one wide panel of daily history for a whole universe.
+
+    Stale symbols are downloaded in batched multi-symbol download() calls.
+    yfinance still sends one chart request per ticker inside each call, so
+    batching saves the per-symbol Python overhead and executor round trips,
+    not upstream requests; each batch is charged one rate-limit token per
+    symbol. Batches run concurrently on the shared fetch executor. Dividends
+    and splits cached from before a refetched window are kept.
+    Columns are a (field, symbol) MultiIndex, e.g. panel["Close"]["BBCA.JK"],
+    and the index is the union of trading dates across all symbols.
+
+    Args:
+        symbols (iterable): Yahoo Finance tickers
+        years (int): length of the history window to keep
+        batch_size (int): symbols per download request
+        cache_dir (str): folder holding one pickle per symbol
+        max_age (timedelta): entries younger than this are served without any request
+        executor (FetchExecutor, optional): defaults to the process-wide shared executor
+        compact (bool): return a CompactPanel (Close/High/Dividends, float32) instead of the wide frame
+        refetch (iterable): symbols to download whole even when cached, e.g. after a dividend announcement
+    """
+    executor = executor or shared_executor()
+    symbols = list(dict.fromkeys(symbols))
+    entries = {symbol: load_cached(symbol, cache_dir) for symbol in symbols}
+    refetch = set(refetch)
+    stale = [s for s in symbols if s in refetch or _is_stale(entries[s], max_age)]
+    cold = [s for s in stale if s in refetch or entries[s] is None or entries[s]["history"].empty]
+    warm = [s for s in stale if s not in cold]
+    profiling.count("price_cache.hits", len(symbols) - len(stale))
+    profiling.count("price_cache.stale", len(warm))
+    profiling.count("price_cache.misses", len(cold))
+
+    # Each batch writes its symbols' cache entries as soon as it arrives, so an
+    # interrupted run loses at most the batches in flight and the next run,
+    # finding those entries fresh, resumes with the rest
+    def update_since_last(batch):
+        start = min(entries[s]["history"].index[-1] for s in batch)
+        frames = _download(list(batch), executor.timeout, start=start.strftime("%Y-%m-%d"))
+        refetch = []
+        for symbol in batch:
+            history = entries[symbol]["history"]
+            fresh = frames.get(symbol)
+            if fresh is None:
+                # No rows, not even the start day: a swallowed error, so no new fetched_at is
+                # written and the next run retries this symbol
+                continue
+            if _has_new_action(history, fresh):
+                profiling.count("price_cache.refetches")
+                refetch.append(symbol)
+                continue
+            entries[symbol] = _entry_from_history(merge_rows(history, fresh), entries[symbol])
+            save_cached(symbol, entries[symbol], cache_dir)
+        return refetch
+
+    def download_window(batch):
+        frames = _download(list(batch), executor.timeout, period=f"{years}y")
+        for symbol in batch:
+            if symbol in frames:
+                entries[symbol] = _entry_from_history(frames[symbol], entries[symbol])
+                save_cached(symbol, entries[symbol], cache_dir)
+
+    warm_results = executor.map(update_since_last, _batches(warm, batch_size), desc="Updating batches", cost=len)
+    for batch, refetch in warm_results.items():
+        if isinstance(refetch, Exception):
+            print(f"Error updating {', '.join(batch)}: {refetch}")
+            continue
+        cold.extend(refetch)
+
+    cold_results = executor.map(download_window, _batches(cold, batch_size), desc="Downloading batches", cost=len)
+    for batch, error in cold_results.items():
+        if isinstance(error, Exception):
+            print(f"Error downloading {', '.join(batch)}: {error}")
+
+    histories = {
+        symbol: _trim(entries[symbol]["history"], years)
+        for symbol in symbols
+        if entries[symbol] is not None and not entries[symbol]["history"].empty
+    }
+    if compact:
+        index = sector_index()
+        sectors = pd.Categorical([index.sector(symbol) for symbol in histories])
+        return CompactPanel.from_histories(histories, sectors)
+    histories = {symbol: history.reindex(columns=PANEL_FIELDS) for symbol, history in histories.items()}
+    if not histories:
+        return pd.DataFrame(columns=pd.MultiIndex.from_product([PANEL_FIELDS, []]))
+    panel = pd.concat(histories, axis=1).swaplevel(axis=1).sort_index(axis=1)
+    panel.columns.names = ["Field", "Symbol"]
+    return panel
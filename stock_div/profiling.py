@@ -0,0 +1,219 @@
+"""
+Opt-in run metrics: stage timers, fetch latency histograms and counters.
+
+Off by default; every hook returns at once until enable() is called, so the
+instrumented code paths cost nothing in normal runs. Switch it on with
+
+    python -m stock_div --profile metrics.json kompas100
+    python -m stock_div --profile metrics.prom info kompas100
+
+or, for the marimo notebooks, STOCK_DIV_PROFILE=metrics.json, which writes
+the file when the process exits. JSON keeps the slowest tickers per fetch
+kind as well; the Prometheus text format suits a textfile collector, so
+runs can be compared over time.
+
+Recorded:
+    stages      wall time and call count per pipeline stage, e.g. "analyze.yields"
+    histograms  per-ticker (or per-batch) fetch latency, e.g. "history", "info"
+    counters    cache hits and misses, requests, retries and failures
+"""
+import atexit
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Latency histogram upper bounds in seconds, Prometheus style (+Inf is implicit)
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SLOWEST = 10
+PREFIX = "stock_div"
+FORMATS = ("json", "prometheus")
+
+_off = nullcontext()
+
+
+class Metrics:
+    """Thread-safe accumulator behind the module-level hooks."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self.stages = {}
+            self.histograms = {}
+            self.counters = Counter()
+            self.slowest = {}
+
+    def add_stage(self, name, seconds):
+        with self._lock:
+            calls, total, longest = self.stages.get(name, (0, 0.0, 0.0))
+            self.stages[name] = (calls + 1, total + seconds, max(longest, seconds))
+
+    def observe(self, name, seconds, key=None):
+        with self._lock:
+            histogram = self.histograms.setdefault(name, {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0})
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram["buckets"][i] += 1
+                    break
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+            if key is not None:
+                # Min-heap of the SLOWEST largest (seconds, key) pairs
+                slowest = self.slowest.setdefault(name, [])
+                if len(slowest) < SLOWEST:
+                    heapq.heappush(slowest, (seconds, str(key)))
+                elif seconds > slowest[0][0]:
+                    heapq.heapreplace(slowest, (seconds, str(key)))
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+                "stages": {name: {"calls": calls, "seconds": round(total, 6), "max_seconds": round(longest, 6)}
+                           for name, (calls, total, longest) in self.stages.items()},
+                "histograms": {name: {"buckets": dict(zip(map(str, self.buckets), h["buckets"])),
+                                      "count": h["count"], "sum": round(h["sum"], 6),
+                                      "slowest": [[key, round(s, 6)] for s, key in sorted(self.slowest.get(name, []), reverse=True)]}
+                               for name, h in self.histograms.items()},
+                "counters": dict(self.counters),
+            }
+
+    def merge(self, snapshot):
+        """Adds a to_dict() snapshot, e.g. one returned by a worker process."""
+        with self._lock:
+            for name, stage in snapshot["stages"].items():
+                calls, total, longest = self.stages.get(name, (0, 0.0, 0.0))
+                self.stages[name] = (calls + stage["calls"], total + stage["seconds"], max(longest, stage["max_seconds"]))
+            for name, h in snapshot["histograms"].items():
+                histogram = self.histograms.setdefault(name, {"buckets": [0] * len(self.buckets), "count": 0, "sum": 0.0})
+                histogram["buckets"] = [a + b for a, b in zip(histogram["buckets"], h["buckets"].values())]
+                histogram["count"] += h["count"]
+                histogram["sum"] += h["sum"]
+                slowest = self.slowest.setdefault(name, [])
+                for key, seconds in h["slowest"]:
+                    heapq.heappush(slowest, (seconds, key))
+                self.slowest[name] = heapq.nlargest(SLOWEST, slowest)
+                heapq.heapify(self.slowest[name])
+            self.counters.update(snapshot["counters"])
+
+    def to_prometheus(self, prefix=PREFIX):
+        snapshot = self.to_dict()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds_total counter",
+            *(f'{prefix}_stage_seconds_total{{stage="{name}"}} {s["seconds"]}' for name, s in snapshot["stages"].items()),
+            f"# TYPE {prefix}_stage_calls_total counter",
+            *(f'{prefix}_stage_calls_total{{stage="{name}"}} {s["calls"]}' for name, s in snapshot["stages"].items()),
+            f"# TYPE {prefix}_fetch_seconds histogram",
+        ]
+        for name, h in snapshot["histograms"].items():
+            cumulative = 0
+            for bound, n in h["buckets"].items():
+                cumulative += n
+                lines.append(f'{prefix}_fetch_seconds_bucket{{kind="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_fetch_seconds_bucket{{kind="{name}",le="+Inf"}} {h["count"]}')
+            lines.append(f'{prefix}_fetch_seconds_sum{{kind="{name}"}} {h["sum"]}')
+            lines.append(f'{prefix}_fetch_seconds_count{{kind="{name}"}} {h["count"]}')
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{name.replace('.', '_')}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+_metrics = Metrics()
+
+
+def enabled():
+    return _metrics.enabled
+
+
+def enable(reset=True):
+    if reset:
+        _metrics.reset()
+    _metrics.enabled = True
+
+
+def disable():
+    _metrics.enabled = False
+
+
+@contextmanager
+def _timed_stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _metrics.add_stage(name, time.perf_counter() - start)
+
+
+@contextmanager
+def _timed_fetch(name, key):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _metrics.observe(name, time.perf_counter() - start, key)
+
+
+def stage(name):
+    """Context manager adding its wall time to a pipeline stage."""
+    return _timed_stage(name) if _metrics.enabled else _off
+
+
+def timed(name, key=None):
+    """Context manager recording one fetch in the `name` latency histogram, e.g. timed("info", symbol)."""
+    return _timed_fetch(name, key) if _metrics.enabled else _off
+
+
+def count(name, n=1):
+    if _metrics.enabled and n:
+        _metrics.count(name, n)
+
+
+def snapshot():
+    return _metrics.to_dict()
+
+
+def merge(snapshot):
+    if _metrics.enabled and snapshot:
+        _metrics.merge(snapshot)
+
+
+def export(fmt="json"):
+    """The metrics so far as JSON or Prometheus text."""
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+    if fmt == "prometheus":
+        return _metrics.to_prometheus()
+    return json.dumps(_metrics.to_dict(), indent=1)
+
+
+def format_for(path):
+    return "prometheus" if path.endswith((".prom", ".txt")) else "json"
+
+
+def write(path, fmt=None):
+    """Writes export(fmt) to path; the format follows the extension (.prom or .txt for Prometheus) by default."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(export(fmt or format_for(path)))
+    print(f"✅ Profile saved to {path}")
+
+
+if os.environ.get("STOCK_DIV_PROFILE"):
+    enable()
+    atexit.register(write, os.path.abspath(os.environ["STOCK_DIV_PROFILE"]))
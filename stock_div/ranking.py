@@ -0,0 +1,72 @@
+"""
+Top-N rankings over the per-stock metrics from kompas.analyze_universe.
+
+Rankings are keyed by ticker (the `symbol` column), so two stocks whose names
+ellipsize to the same label never collide. Each ranking is a weighted sum of
+any metric columns; only the top N rows are selected with argpartition and
+then sorted, instead of sorting the whole table. Nothing here fetches, so
+changing N, weights or the combine rule on cached results is instant.
+"""
+import numpy as np
+
+# label -> {metric column: weight}
+DEFAULT_CRITERIA = {
+    "2y": {"avg_2y": 1.0},
+    "5y": {"avg_5y": 1.0},
+    "10y": {"avg_10y": 1.0},
+}
+RULES = ("intersection", "union")
+
+
+def _key(results):
+    return "symbol" if "symbol" in results.columns else "name"
+
+
+def top_n(results, n, weights):
+    """
+    The n rows with the highest weighted score, best first.
+
+    Rows missing any weighted metric are left out, like dropna() before a sort.
+
+    Args:
+        results (DataFrame): one row per stock
+        n (int): list size
+        weights (dict): {metric column: weight}; negative weights rank low values first
+    """
+    if n <= 0:
+        return results.iloc[:0]
+    columns = list(weights)
+    scores = results[columns].to_numpy(dtype=float) @ np.array([weights[c] for c in columns], dtype=float)
+    candidates = np.flatnonzero(~np.isnan(scores))
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(-scores[candidates], n - 1)[:n]]
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return results.iloc[order]
+
+
+def combine(results, tables, rule="intersection", sort_by="avg_5y"):
+    """
+    Stocks in every table ("intersection") or in any table ("union"),
+    matched by ticker and sorted by `sort_by`, best first.
+    """
+    if rule not in RULES:
+        raise ValueError(f"rule must be one of {RULES}, got {rule!r}")
+    key = _key(results)
+    keys = [set(table[key]) for table in tables]
+    chosen = set.intersection(*keys) if rule == "intersection" else set.union(*keys)
+    return results[results[key].isin(chosen)].sort_values(sort_by, ascending=False)
+
+
+def rank(results, n=20, criteria=DEFAULT_CRITERIA, rule="intersection", sort_by="avg_5y"):
+    """
+    Returns ({label: top-n table}, combined table) for the given criteria.
+
+    Args:
+        results (DataFrame): output of kompas.analyze_universe
+        n (int): size of each top list
+        criteria (dict): {label: {metric column: weight}}, e.g. {"blend": {"avg_5y": 0.7, "avg_10y": 0.3}}
+        rule (str): "intersection" or "union" of the top lists
+        sort_by (str): metric column that orders the combined table
+    """
+    tables = {label: top_n(results, n, weights) for label, weights in criteria.items()}
+    return tables, combine(results, list(tables.values()), rule, sort_by)
@@ -0,0 +1,241 @@
+"""
+Daily incremental refresh driven by the investing.com dividend calendar.
+
+    python -m stock_div refresh --universe stocks [--at 18:00] [--once]
+
+Each run scrapes the calendar around the last run and works out which symbols
+have a dividend event the previous run had not seen (a new announcement or a
+changed amount or payment date) or an ex-date that passed since then. Only
+those symbols are refetched (their whole history window, since Yahoo
+back-adjusts closes around a payout) and reanalyzed; every other symbol keeps
+its row from the saved results. The rankings and reports are then rebuilt
+from the merged table, which takes a few milliseconds.
+
+The first run, a run with --full, or a run whose saved results are missing
+fetches the universe with the usual cache age instead.
+"""
+import json
+import os
+import pickle
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from stock_div.dividend_calendar import DEFAULT_HEADERS, FIELDNAMES, URL, YAHOO_SUFFIXES, fetch_calendar_rows, make_session
+from stock_div.kompas import REPORT_FILE, analyze_universe, top_lists, write_report
+from stock_div.price_cache import CACHE_DIR, fetch_universe
+from stock_div.report import FORMATS
+from stock_div.universes import market_label
+
+RUN_AT = "18:00"
+# Calendar window scraped on each run, relative to the last run and to today
+LOOKBACK = timedelta(days=7)
+LOOKAHEAD = timedelta(days=14)
+# Seen events are forgotten once their ex-date (or, when it did not parse, the day
+# they were first seen) is this far in the past
+SEEN_RETENTION = timedelta(days=90)
+
+
+def state_path(universe_name, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"refresh_{universe_name}.json")
+
+
+def results_path(universe_name, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"refresh_{universe_name}_results.pkl")
+
+
+def load_state(path):
+    """{"last_run": ISO timestamp or None, "seen": {event key: ex-date, or the first-seen date}}."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"last_run": None, "seen": {}}
+
+
+def save_state(state, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def load_results(path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def calendar_payloads(universe, date_from, date_to):
+    """One custom-range payload per calendar country that has symbols in the universe."""
+    symbols = list(universe.values())
+    return [
+        {'country[]': country, 'dateFrom': f"{date_from:%Y-%m-%d}", 'dateTo': f"{date_to:%Y-%m-%d}",
+         'currentTab': 'custom', 'limit_from': 0}
+        for country, suffix in YAHOO_SUFFIXES.items()
+        if any(symbol.endswith(suffix) for symbol in symbols)
+    ]
+
+
+def calendar_events(session, payloads, url=URL, executor=None):
+    """
+    Calendar rows for every payload as one frame with the Yahoo `symbol`, an
+    `ex_day` Timestamp and an event `key` that changes whenever the ex-date,
+    amount or payment date of an announcement does.
+    """
+    rows = []
+    for payload in payloads:
+        suffix = YAHOO_SUFFIXES.get(payload.get('country[]'), "")
+        for row in fetch_calendar_rows(session, payload, url, executor):
+            rows.append(dict(row, symbol=f"{row['ticker']}{suffix}"))
+    events = pd.DataFrame(rows, columns=FIELDNAMES + ["symbol"])
+    events["ex_day"] = pd.to_datetime(events["ex_date"], format="%d/%m/%Y", errors="coerce")
+    events["key"] = (events["symbol"] + "|" + events["ex_date"].astype(str) + "|"
+                     + events["dividend"].astype(str) + "|" + events["payment_date"].astype(str))
+    return events
+
+
+def affected_symbols(events, seen, last_run, as_of):
+    """Symbols with an event not in `seen`, or whose ex-date fell in (last_run, as_of]."""
+    new = ~events["key"].isin(seen)
+    went_ex = (events["ex_day"] > pd.Timestamp(last_run)) & (events["ex_day"] <= pd.Timestamp(as_of))
+    return set(events.loc[new | went_ex, "symbol"])
+
+
+def _prune(seen, events, as_of):
+    cutoff = f"{as_of - SEEN_RETENTION:%Y-%m-%d}"
+    # An unparseable ex-date expires from the day it was first seen; states written
+    # before that have "" there and are dropped on the next run
+    kept = {key: day for key, day in seen.items() if day and day >= cutoff}
+    first_seen = f"{as_of:%Y-%m-%d}"
+    for key, ex_day in zip(events["key"], events["ex_day"].dt.strftime("%Y-%m-%d")):
+        kept[key] = ex_day if isinstance(ex_day, str) else kept.get(key, first_seen)
+    return kept
+
+
+def merge_results(previous, fresh, universe, refreshed):
+    """
+    Previous rows for symbols outside `refreshed`, fresh rows (or None) for the
+    rest, restricted to the universe and in its order.
+    """
+    kept = previous[~previous["symbol"].isin(refreshed)] if previous is not None else None
+    parts = [frame for frame in (kept, fresh) if frame is not None and len(frame)]
+    if not parts:
+        return pd.DataFrame(columns=["symbol"])
+    results = pd.concat(parts, ignore_index=True)
+    order = {symbol: i for i, symbol in enumerate(universe.values())}
+    position = results["symbol"].map(order)
+    results = results[position.notna()]
+    return results.iloc[np.argsort(position[position.notna()].to_numpy(), kind="stable")].reset_index(drop=True)
+
+
+def run_once(universe_name, universe, session=None, as_of=None, full=False, n=20, rule="intersection",
+             report_path=REPORT_FILE, formats=FORMATS, chart=False, chart_dpi=300, cache_dir=CACHE_DIR,
+             url=URL, executor=None):
+    """
+    One incremental refresh: scrape, refetch and reanalyze the affected
+    symbols, rebuild the reports from the merged results.
+
+    Args:
+        universe_name (str): names the saved state and results, e.g. "stocks"
+        universe (dict): display name -> Yahoo ticker
+        session (requests.Session, optional): calendar session; defaults to one with DEFAULT_HEADERS
+        as_of (datetime, optional): defaults to now
+        full (bool): ignore the saved results and analyze the whole universe
+
+    Returns:
+        (results DataFrame, set of symbols whose whole window was refetched).
+        When the calendar cannot be read, the saved results are kept and the
+        next run scrapes the same window again.
+    """
+    as_of = as_of or datetime.now()
+    state_file, results_file = state_path(universe_name, cache_dir), results_path(universe_name, cache_dir)
+    state = load_state(state_file)
+    previous = None if full else load_results(results_file)
+    last_run = datetime.fromisoformat(state["last_run"]) if state.get("last_run") else None
+
+    session = session or make_session(DEFAULT_HEADERS)
+    payloads = calendar_payloads(universe, (last_run or as_of) - LOOKBACK, as_of + LOOKAHEAD)
+    try:
+        events = calendar_events(session, payloads, url, executor)
+    except Exception as e:
+        events = None
+        print(f"⚠️ Dividend calendar unavailable: {e}")
+
+    symbols = set(universe.values())
+    incremental = previous is not None and last_run is not None
+    if not incremental:
+        refreshed = symbols
+        print(f"Full analysis of {len(refreshed)} symbols...")
+    elif events is None:
+        refreshed = set()
+    else:
+        refreshed = affected_symbols(events, state.get("seen", {}), last_run, as_of) & symbols
+        print(f"{len(refreshed)} of {len(symbols)} symbols affected since {last_run:%Y-%m-%d %H:%M}"
+              + (f": {', '.join(sorted(refreshed))}" if refreshed else ""))
+    # Symbols without a saved row (added to the universe, or no history last time) are
+    # analyzed from the cache as well; only the affected ones bypass its age
+    missing = symbols - set(previous["symbol"]) if incremental else set()
+
+    fresh = None
+    if refreshed or missing:
+        subset = {name: symbol for name, symbol in universe.items() if symbol in refreshed | missing}
+        panel = fetch_universe(subset.values(), cache_dir=cache_dir, executor=executor,
+                               compact=True, refetch=refreshed if incremental else ())
+        fresh = analyze_universe(subset, as_of, panel=panel)
+    results = merge_results(previous if incremental else None, fresh, universe, refreshed | missing)
+    save_results(results, results_file)
+
+    top_2y, top_5y, top_10y, triple_overlap = top_lists(results, n, rule)
+    write_report(as_of, top_2y, top_5y, top_10y, triple_overlap, path=report_path, formats=formats, n=n, rule=rule)
+    if chart:
+        import matplotlib
+        matplotlib.use("Agg")
+        from stock_div.charts import render_charts
+
+        filename = f"{market_label(universe_name)}_Performance_Report_{as_of.strftime('%Y%m%d')}.png"
+        render_charts([(top_2y, top_5y, top_10y, triple_overlap, filename)], dpi=chart_dpi, n=n, rule=rule)
+
+    if events is None and incremental:
+        # Keep last_run where it was, so the next run scrapes this window again
+        return results, refreshed
+    seen = state.get("seen", {})
+    if events is not None:
+        seen = _prune(seen, events, as_of)
+    save_state({"last_run": as_of.isoformat(timespec="seconds"), "seen": seen}, state_file)
+    return results, refreshed
+
+
+def next_run(at=RUN_AT, now=None):
+    """The next datetime at the given "HH:MM" local time."""
+    now = now or datetime.now()
+    hour, minute = map(int, at.split(":"))
+    scheduled = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return scheduled if scheduled > now else scheduled + timedelta(days=1)
+
+
+def run_forever(universe_name, universe, at=RUN_AT, headers=DEFAULT_HEADERS, **kwargs):
+    """Runs once now, then every day at `at`; errors are printed and the schedule continues."""
+    session = make_session(headers)
+    while True:
+        try:
+            run_once(universe_name, universe, session=session, **kwargs)
+        except Exception as e:
+            print(f"⚠️ Refresh failed: {e}")
+        kwargs["full"] = False
+        wake_at = next_run(at)
+        print(f"Next refresh at {wake_at:%Y-%m-%d %H:%M}")
+        time.sleep(max(0, (wake_at - datetime.now()).total_seconds()))
@@ -0,0 +1,209 @@
+"""
+Report rendering for the Kompas100 analysis: TXT, Markdown, HTML and JSON.
+
+Every table is formatted column by column with NumPy string operations
+instead of per-row f-strings. The formatted cells are computed once per
+section and shared by all four output formats, so there is one code path
+and adding a format does not re-format the data.
+"""
+import json
+import os
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+FORMATS = ("txt", "md", "html", "json")
+RULE_WIDTH = 95
+TITLE = "STI COMPREHENSIVE PERFORMANCE REPORT"
+# Titles follow the top-N size and the elite rule the lists were ranked with
+ELITE_TITLES = {
+    "intersection": '👑 ELITE PERFORMERS (Top {n} in 2Y, 5Y, & 10Y)',
+    "union": '👑 ELITE PERFORMERS (Top {n} in 2Y, 5Y, or 10Y)',
+}
+TOP_TITLE = "TOP {n} - {years} YEAR AVG YIELD"
+# YlGn, light to dark, for the yield gradient in HTML
+GRADIENT = ["#ffffe5", "#d9f0a3", "#78c679", "#238443", "#004529"]
+DEEP_DRAWDOWN = -20
+
+
+def build_sections(top_2y, top_5y, top_10y, triple_overlap, n=20, rule="intersection"):
+    """
+    The report's tables in order, each with the columns it shows.
+
+    Args:
+        n (int): size of each top-N list, for the titles
+        rule (str): "intersection" or "union", how the elite list was built
+    """
+    return [
+        # For Elite, we default to showing the 10Y High drawdown
+        {"title": ELITE_TITLES[rule].format(n=n), "frame": triple_overlap, "yield_col": None, "drawdown_col": "drawdown_10y"},
+        {"title": TOP_TITLE.format(n=n, years=2), "frame": top_2y, "yield_col": "avg_2y", "drawdown_col": "drawdown_2y"},
+        {"title": TOP_TITLE.format(n=n, years=5), "frame": top_5y, "yield_col": "avg_5y", "drawdown_col": "drawdown_5y"},
+        {"title": TOP_TITLE.format(n=n, years=10), "frame": top_10y, "yield_col": "avg_10y", "drawdown_col": "drawdown_10y"},
+    ]
+
+
+def _drawdown_label(drawdown_col):
+    return '2Y HIGH%' if '2y' in drawdown_col else '5Y HIGH%' if '5y' in drawdown_col else '10Y HIGH%'
+
+
+def _columns(yield_col, drawdown_col):
+    """
+    (source column, header, TXT header width, cell formatter) per column.
+    Formatters take a NumPy array and return the TXT cell strings.
+    """
+    # Missing values (union elites, short histories) print as N/A, like the original report
+    def number(fmt):
+        def cells(values):
+            values = values.astype(float)
+            return np.char.rjust(np.where(np.isnan(values), 'N/A', np.char.mod(fmt, values)), len(fmt % 0))
+        return cells
+
+    def percent_text(values):
+        values = values.astype(float)
+        return np.char.rjust(np.char.add(np.where(np.isnan(values), 'N/A', values.astype(str)), '%'), 10)
+
+    columns = [("name", "NAME", 12, lambda values: np.char.ljust(values.astype(str), 12))]
+    if yield_col:
+        columns.append((yield_col, "YIELD", 8, number('%6.2f%%')))
+    else:
+        columns += [
+            ("avg_2y", "2Y%", 6, number('%5.1f%%')),
+            ("avg_5y", "5Y%", 6, number('%5.1f%%')),
+            ("avg_10y", "10Y%", 6, number('%5.1f%%')),
+        ]
+    columns += [
+        ("latest_price", "PRICE", 8, number('%8.2f')),
+        (drawdown_col, _drawdown_label(drawdown_col), 10, percent_text),
+        ("high_1y_pct", "1Y HIGH %", 10, percent_text),
+    ]
+    return columns
+
+
+def format_section(section):
+    """Formats a section's frame once; the result feeds every renderer."""
+    frame = section["frame"]
+    columns = _columns(section["yield_col"], section["drawdown_col"])
+    cells = [fmt(frame[source].to_numpy()) if len(frame) else np.array([], dtype=str) for source, _, _, fmt in columns]
+    return dict(section, columns=columns, cells=cells)
+
+
+def _join(arrays, separator):
+    return reduce(lambda left, right: np.char.add(np.char.add(left, separator), right), arrays)
+
+
+def render_txt(formatted, as_of):
+    out = [f"{TITLE} ({as_of.strftime('%Y-%m-%d')})\n", '=' * RULE_WIDTH + '\n']
+    for section in formatted:
+        if section["yield_col"] is None and section["frame"].empty:
+            out.append('\n👑 ELITE PERFORMERS: No stocks qualified.\n')
+            continue
+        out.append(f'\n--- {section["title"]} ---\n')
+        out.append(" | ".join(f"{header:<{width}}" for _, header, width, _ in section["columns"]) + "\n")
+        out.append('-' * RULE_WIDTH + '\n')
+        if len(section["frame"]):
+            out.append("\n".join(_join(section["cells"], " | ").tolist()) + "\n")
+    return "".join(out)
+
+
+def render_md(formatted, as_of):
+    out = [f"# {TITLE} ({as_of.strftime('%Y-%m-%d')})\n"]
+    for section in formatted:
+        out.append(f"\n## {section['title']}\n\n")
+        if section["frame"].empty:
+            out.append("No stocks qualified.\n")
+            continue
+        headers = [header for _, header, _, _ in section["columns"]]
+        out.append("| " + " | ".join(headers) + " |\n")
+        out.append("|" + "|".join(["---"] + ["---:"] * (len(headers) - 1)) + "|\n")
+        cells = [np.char.strip(column) for column in section["cells"]]
+        out.append("\n".join(np.char.add(np.char.add("| ", _join(cells, " | ")), " |").tolist()) + "\n")
+    return "".join(out)
+
+
+def _gradient_styles(values):
+    """Per-column YlGn background, min to max, like Styler.background_gradient; NaN cells stay unstyled."""
+    values = values.astype(float)
+    present = ~np.isnan(values)
+    if not present.any():
+        return np.full(len(values), "")
+    low, high = values[present].min(), values[present].max()
+    span = high - low if high > low else 1.0
+    bins = np.zeros(len(values), dtype=int)
+    bins[present] = np.clip(((values[present] - low) / span * len(GRADIENT)).astype(int), 0, len(GRADIENT) - 1)
+    colors = np.array(GRADIENT)[bins]
+    text = np.where(bins >= 3, "#ffffff", "#000000")
+    styles = np.char.add(np.char.add(np.char.add("background-color: ", colors), "; color: "), text)
+    return np.where(present, styles, "")
+
+
+def _escape(cells):
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;")):
+        cells = np.char.replace(cells, char, entity)
+    return cells
+
+
+def _deep_drawdown_styles(values):
+    values = values.astype(float)
+    return np.where(values <= DEEP_DRAWDOWN, "background-color: #ffcccc; color: #cc0000; font-weight: bold", "")
+
+
+def render_html(formatted, as_of):
+    out = [f"<h2>{TITLE} ({as_of.strftime('%Y-%m-%d')})</h2>\n"]
+    for section in formatted:
+        out.append(f"<table class='dividend-report'>\n<caption><b>{section['title']}</b></caption>\n")
+        headers = "".join(f"<th>{header}</th>" for _, header, _, _ in section["columns"])
+        out.append(f"<thead><tr>{headers}</tr></thead>\n<tbody>\n")
+        if len(section["frame"]):
+            yield_sources = {"avg_2y", "avg_5y", "avg_10y"} if section["yield_col"] is None else {section["yield_col"]}
+            tds = []
+            for (source, _, _, _), cells in zip(section["columns"], section["cells"]):
+                values = section["frame"][source].to_numpy()
+                if source in yield_sources:
+                    styles = _gradient_styles(values)
+                elif source in (section["drawdown_col"], "high_1y_pct"):
+                    styles = _deep_drawdown_styles(values)
+                else:
+                    styles = np.full(len(cells), "")
+                opening = np.char.add(np.char.add("<td style='text-align: center; padding: 8px; ", styles), "'>")
+                tds.append(np.char.add(np.char.add(opening, _escape(np.char.strip(cells))), "</td>"))
+            rows = np.char.add(np.char.add("<tr>", _join(tds, "")), "</tr>")
+            out.append("\n".join(rows.tolist()) + "\n")
+        out.append("</tbody>\n</table>\n")
+    return "".join(out)
+
+
+def render_json(formatted, as_of):
+    report = {"title": TITLE, "date": as_of.strftime('%Y-%m-%d'), "sections": []}
+    for section in formatted:
+        sources = [source for source, _, _, _ in section["columns"]]
+        frame = section["frame"][sources] if len(section["frame"]) else pd.DataFrame(columns=sources)
+        rows = json.loads(frame.to_json(orient="records"))
+        report["sections"].append({"title": section["title"], "columns": sources, "rows": rows})
+    return json.dumps(report, ensure_ascii=False, indent=2)
+
+
+RENDERERS = {"txt": render_txt, "md": render_md, "html": render_html, "json": render_json}
+
+
+def render(sections, as_of, formats=FORMATS):
+    """Returns {format: text} for the given sections, formatting each table once."""
+    formatted = [format_section(section) for section in sections]
+    return {fmt: RENDERERS[fmt](formatted, as_of) for fmt in formats}
+
+
+def write_reports(sections, as_of, path, formats=FORMATS):
+    """
+    Writes every format next to each other: report.txt, report.md, report.html, report.json.
+
+    Returns the list of written paths.
+    """
+    stem = os.path.splitext(path)[0]
+    paths = []
+    for fmt, text in render(sections, as_of, formats).items():
+        out_path = f"{stem}.{fmt}"
+        with open(out_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        paths.append(out_path)
+    return paths
@@ -0,0 +1,127 @@
+"""
+One sector classification for every universe, keyed by Yahoo ticker.
+
+Built from the static maps in stock_div.sectors (SG names and IDX codes) plus
+the sectors already cached by stock_div.info_cache, then persisted as JSON.
+Besides tickers, every display name is indexed by all of its prefixes, so an
+ellipsized chart label like "Mapletree L…" resolves with one dict lookup.
+"""
+import json
+import os
+import threading
+
+from stock_div.info_cache import CACHE_FILE as INFO_CACHE_FILE
+from stock_div.sectors import (sector_colors, sector_colors_1, sector_map, sector_map_1, sg_name_keys,
+                               yahoo_sector_map, yahoo_sector_map_1)
+from stock_div.universes import sg
+
+INDEX_FILE = "./data/cache/sector_index.json"
+OTHER = "Other"
+IDX_SUFFIX = ".JK"
+
+
+class SectorIndex:
+    """
+    {ticker: sector} plus a {name prefix: ticker} lookup and {sector: color}.
+
+    Static SG names with no known ticker are kept under the name itself.
+    """
+
+    def __init__(self, sectors=None, prefixes=None, colors=None):
+        self.sectors = sectors or {}
+        self.prefixes = prefixes or {}
+        self.colors = colors or {}
+
+    def add(self, key, sector, names=()):
+        """Registers a ticker (first registration wins) and the names that refer to it."""
+        self.sectors.setdefault(key, sector)
+        for name in (key, *names):
+            for end in range(1, len(name) + 1):
+                self.prefixes.setdefault(name[:end], key)
+
+    def ticker(self, label):
+        """Ticker for a ticker, display name, or truncated label ("Mapletree L…"); None if unknown."""
+        if label in self.sectors:
+            return label
+        return self.prefixes.get(label.replace('…', ''))
+
+    def sector(self, label):
+        return self.sectors.get(self.ticker(label), OTHER)
+
+    def color(self, label, default='black'):
+        return self.colors.get(self.sector(label), default)
+
+    def to_dict(self):
+        return {"sectors": self.sectors, "prefixes": self.prefixes, "colors": self.colors}
+
+
+def build_index(info_path=INFO_CACHE_FILE):
+    """Static maps first, then Yahoo sectors from the info cache for anything they miss."""
+    index = SectorIndex(colors={**sector_colors, **sector_colors_1})
+
+    for code, sector in sector_map_1.items():
+        index.add(code + IDX_SUFFIX, sector, names=[code])
+
+    # SG display names are longer than the static keys ("Mapletree Logistics Trust" vs "Mapletree Log");
+    # sg_name_keys covers the ones that are not prefixes ("City Developments" vs "CityDev")
+    for name, ticker in sg.items():
+        static = sg_name_keys.get(name) or next(
+            (key for key in sector_map if name.startswith(key) or key.startswith(name)), None)
+        if static:
+            index.add(ticker, sector_map[static], names=[name, static])
+    for static, sector in sector_map.items():
+        if static not in index.prefixes:
+            index.add(static, sector)
+
+    if os.path.exists(info_path):
+        try:
+            with open(info_path, encoding="utf-8") as f:
+                info = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            info = {}
+        for ticker, fields in info.items():
+            sector = (fields.get("sector") or {}).get("value")
+            if sector:
+                # Yahoo's names onto the chart's sector keys, so they get a color and a legend entry
+                yahoo_map = yahoo_sector_map_1 if ticker.endswith(IDX_SUFFIX) else yahoo_sector_map
+                sector = yahoo_map.get(sector, sector if sector in index.colors else OTHER)
+                name = (fields.get("shortName") or {}).get("value")
+                index.add(ticker, sector, names=[name] if name else [])
+    return index
+
+
+def load_index(path=INDEX_FILE, info_path=INFO_CACHE_FILE):
+    """
+    Reads the persisted index, rebuilding it when the info cache or the
+    static maps changed since it was written.
+    """
+    here = os.path.dirname(__file__)
+    sources = [info_path, __file__, os.path.join(here, "sectors.py"), os.path.join(here, "universes.py")]
+    built_at = os.path.getmtime(path) if os.path.exists(path) else None
+    if built_at is not None and all(not os.path.exists(s) or os.path.getmtime(s) <= built_at for s in sources):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return SectorIndex(**json.load(f))
+        except (OSError, json.JSONDecodeError, TypeError):
+            pass
+
+    index = build_index(info_path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index.to_dict(), f)
+    os.replace(tmp_path, path)
+    return index
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def sector_index():
+    """The process-wide index, loaded on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = load_index()
+        return _shared
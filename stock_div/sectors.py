@@ -0,0 +1,58 @@
+"""
+Static sector classification and chart colors.
+
+`sector_map`/`sector_colors` cover the SG names, `sector_map_1`/`sector_colors_1`
+cover the IDX codes, and `yahoo_sector_map`/`yahoo_sector_map_1` fold Yahoo's
+sector names into those same keys (and colors) for each market. Lookups go through stock_div.sector_index, which merges
+these with the sectors cached from Yahoo.
+"""
+
+# SG names (add any missing stocks here)
+sector_map = {
+    "DBS": "Financials", "OCBC": "Financials", "UOB": "Financials", "SGX": "Financials",
+    "Singtel": "Communications", "StarHub": "Communications", "NetLink NBN": "Communications",
+    "CICT": "REITs", "Ascendas REIT": "REITs", "Mapletree Log": "REITs", "Mapletree Ind": "REITs",
+    "Mapletree PanAsia": "REITs", "Frasers Cpt Tr": "REITs", "Frasers L&C": "REITs", "Keppel DC REIT": "REITs",
+    "Keppel REIT": "REITs",
+    "Keppel Ltd": "Industrials/Utilities", "ST Engineering": "Industrials/Utilities", "SATS": "Industrials/Utilities",
+    "Seatrium": "Industrials/Utilities", "Sembcorp Ind": "Industrials/Utilities", "Yangzijiang": "Industrials/Utilities",
+    "CapitaLand Invest": "Real Estate", "CityDev": "Real Estate", "HK Land": "Real Estate", "UOL Group": "Real Estate",
+    "SIA": "Transport", "Venture": "Technology", "Wilmar": "Consumer Staples", "ThaiBev": "Consumer Staples",
+    "Genting Sing": "Consumer Discretionary", "DFI Retail": "Consumer Staples", "Jardine Math": "Conglomerates", "Jardine C&C": "Conglomerates",
+    "Emperador": "Consumer Staples",
+}
+
+# SG display names (stock_div.universes.sg) whose sector_map key is not a prefix of them
+sg_name_keys = {
+    "City Developments": "CityDev", "Hongkong Land": "HK Land", "Mapletree Pan Asia Com Tr": "Mapletree PanAsia",
+    "Frasers Centrepoint Trust": "Frasers Cpt Tr", "Frasers Logistics & Com Tr": "Frasers L&C",
+    "Thai Beverage": "ThaiBev",
+}
+
+# SG sector colors
+sector_colors = {
+    "Financials": "#1f77b4", "REITs": "#ff7f0e", "Industrials/Utilities": "#2ca02c",
+    "Real Estate": "#9467bd", "Communications": "#e377c2", "Consumer Staples": "#8c564b",
+    "Consumer Discretionary": "#d62728", "Transport": "#7f7f7f", "Technology": "#17becf", "Conglomerates": "#bcbd22",
+    "Other": "#000000"
+}
+
+# IDX codes
+sector_map_1 = {'BBCA': 'Financials', 'BBRI': 'Financials', 'BMRI': 'Financials', 'BBNI': 'Financials', 'BBTN': 'Financials', 'BRIS': 'Financials', 'BDMN': 'Financials', 'ARTO': 'Financials', 'BJBR': 'Financials', 'BJTM': 'Financials', 'BBYB': 'Financials', 'PNLF': 'Financials', 'ADRO': 'Energy', 'ITMG': 'Energy', 'PTBA': 'Energy', 'ANTM': 'Basic Materials', 'INCO': 'Basic Materials', 'MEDC': 'Energy', 'HRUM': 'Energy', 'AKRA': 'Energy', 'AMMN': 'Basic Materials', 'BREN': 'Energy', 'CUAN': 'Energy', 'PGEO': 'Infrastructure', 'MBMA': 'Basic Materials', 'NCKL': 'Basic Materials', 'ELSA': 'Energy', 'ENRG': 'Energy', 'TOBA': 'Energy', 'SGER': 'Energy', 'AADI': 'Energy', 'UNVR': 'Consumer Non-Cyclical', 'ICBP': 'Consumer Non-Cyclical', 'INDF': 'Consumer Non-Cyclical', 'MYOR': 'Consumer Non-Cyclical', 'SIDO': 'Healthcare', 'HMSP': 'Consumer Non-Cyclical', 'CPIN': 'Consumer Non-Cyclical', 'JPFA': 'Consumer Non-Cyclical', 'CMRY': 'Consumer Non-Cyclical', 'KLBF': 'Healthcare', 'AMRT': 'Consumer Cyclical', 'ACES': 'Consumer Cyclical', 'ERAA': 'Consumer Cyclical', 'MAPI': 'Consumer Cyclical', 'MAPA': 'Consumer Cyclical', 'FILM': 'Consumer Cyclical', 'TLKM': 'Infrastructure', 'ISAT': 'Infrastructure', 'EXCL': 'Infrastructure', 'MTEL': 'Infrastructure', 'TOWR': 'Infrastructure', 'JSMR': 'Infrastructure', 'WIFI': 'Infrastructure', 'INET': 'Infrastructure', 'GOTO': 'Technology', 'BUKA': 'Technology', 'EMTK': 'Technology', 'SCMA': 'Technology', 'ASII': 'Industrials', 'UNTR': 'Industrials', 'SMGR': 'Basic Materials', 'INTP': 'Basic Materials', 'TPIA': 'Basic Materials', 'BRPT': 'Basic Materials', 'INKP': 'Basic Materials', 'DSSA': 'Energy', 'IMPC': 'Basic Materials', 'ESSA': 'Basic Materials', 'BSDE': 'Property', 'PWON': 'Property', 'CTRA': 'Property', 'SMRA': 'Property', 'PANI': 'Property', 'HEAL': 'Healthcare', 'MIKA': 'Healthcare'}
+sector_colors_1 = {'Financials': '#1f77b4', 'Energy': '#d62728', 'Basic Materials': '#8c564b', 'Consumer Non-Cyclical': '#2ca02c', 'Consumer Cyclical': '#e377c2', 'Infrastructure': '#ff7f0e', 'Technology': '#17becf', 'Industrials': '#7f7f7f', 'Property': '#9467bd', 'Healthcare': '#bcbd22', 'Other': '#000000'}  # Financials  # Energy & Mining  # Consumer Non-Cyclicals (Staples)  # Consumer Cyclicals (Retail/Entertainment)  # Infrastructure & Telco  # Technology  # Industrials & Basic Materials  # Property & Real Estate  # Healthcare  # Deep Blue  # Red (Energy/Oil/Coal)  # Brown  # Forest Green  # Pink  # Orange (Telco/Towers)  # Cyan/Light Blue  # Grey  # Purple  # Olive Green  # Black default
+
+# Yahoo info "sector" -> SG sector key
+yahoo_sector_map = {
+    "Financial Services": "Financials", "Real Estate": "Real Estate", "Communication Services": "Communications",
+    "Industrials": "Industrials/Utilities", "Utilities": "Industrials/Utilities", "Technology": "Technology",
+    "Consumer Defensive": "Consumer Staples", "Consumer Cyclical": "Consumer Discretionary",
+    "Energy": "Energy", "Basic Materials": "Basic Materials", "Healthcare": "Healthcare",
+}
+
+# Yahoo info "sector" -> IDX sector key
+yahoo_sector_map_1 = {
+    "Financial Services": "Financials", "Real Estate": "Property", "Communication Services": "Infrastructure",
+    "Industrials": "Industrials", "Utilities": "Infrastructure", "Technology": "Technology",
+    "Consumer Defensive": "Consumer Non-Cyclical", "Consumer Cyclical": "Consumer Cyclical",
+    "Energy": "Energy", "Basic Materials": "Basic Materials", "Healthcare": "Healthcare",
+}
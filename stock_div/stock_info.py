@@ -0,0 +1,118 @@
+"""
+Company name, sector and market cap for a list of tickers.
+
+Used by ticker_info_to_csv.py and by `python -m stock_div info`.
+"""
+import pandas as pd
+
+from stock_div import profiling
+from stock_div.info_cache import fetch_info
+from stock_div.storage import export_csv, write_partition
+from stock_div.universe_registry import load_registry
+
+
+# Helper: convert large numbers to human-readable
+def human_readable_number(num):
+    try:
+        num = float(num)
+    except (TypeError, ValueError):
+        return "N/A"
+    if num >= 1_000_000_000_000:
+        return f"{num/1_000_000_000_000:.1f}T"
+    elif num >= 1_000_000_000:
+        return f"{num/1_000_000_000:.1f}B"
+    elif num >= 1_000_000:
+        return f"{num/1_000_000:.1f}M"
+    elif num >= 1_000:
+        return f"{num/1_000:.1f}K"
+    else:
+        return str(num)
+
+
+INFO_FIELDS = ("shortName", "sector", "marketCap")
+
+
+def fetch_and_save_stock_info(ticker_list, list_name=None, save_csv=True, executor=None):
+    """
+    Fetch stock info from Yahoo Finance and save to Parquet, plus CSV if asked.
+
+    Args:
+        ticker_list (list or set): list of tickers
+        list_name (str, optional): universe partition and CSV file name. If None, defaults to 'custom'
+        save_csv (bool): also write ./data/<list_name>_stock_info.csv
+        executor (FetchExecutor, optional): defaults to the process-wide shared executor
+    """
+    all_tickers = list(ticker_list)  # in case it's a set
+
+    # Only expired fields are refreshed, concurrently; failures come back as exceptions
+    with profiling.stage("info.fetch"):
+        infos = fetch_info(all_tickers, INFO_FIELDS, executor=executor)
+    save_stock_info(all_tickers, infos, list_name, save_csv)
+
+
+def fetch_and_save_universes(names, save_csv=True, executor=None, registry=None):
+    """
+    Same as fetch_and_save_stock_info for several registered universes at once.
+
+    Each distinct ticker is fetched once, then its info is saved under every
+    universe that contains it.
+
+    Args:
+        names (list): registered universe names, e.g. ["kompas100", "sti"]
+        save_csv (bool): also write ./data/<name>_stock_info.csv per universe
+        executor (FetchExecutor, optional): defaults to the process-wide shared executor
+        registry (UniverseRegistry, optional): defaults to ./data/universes.json
+    """
+    registry = registry or load_registry()
+    symbols = registry.symbols(*names)
+    total = sum(len(registry.symbols(name)) for name in names)
+    print(f"Fetching {len(symbols)} distinct tickers for {', '.join(names)} ({total - len(symbols)} shared)")
+
+    with profiling.stage("info.fetch"):
+        infos = fetch_info(symbols, INFO_FIELDS, executor=executor)
+    for name, universe_infos in registry.fan_out(infos, names).items():
+        save_stock_info(list(universe_infos), universe_infos, name, save_csv)
+
+
+def save_stock_info(all_tickers, infos, list_name=None, save_csv=True):
+    """Writes fetched info ({ticker: {field: value} or Exception}) for one universe."""
+    company_data = []
+
+    for ticker_symbol in all_tickers:
+        info = infos[ticker_symbol]
+        if isinstance(info, Exception):
+            company_data.append({
+                "Company": "Error",
+                "Ticker": ticker_symbol,
+                "Sector": "Error",
+                "Market Cap": "Error",
+                "Market Cap Raw": "Error"
+            })
+            continue
+
+        name = info.get("shortName", "N/A")
+        sector = info.get("sector", "N/A")
+        mcap = info.get("marketCap", "N/A")
+        mcap_read = human_readable_number(mcap)
+
+        company_data.append({
+            "Company": name,
+            "Ticker": ticker_symbol,
+            "Sector": sector,
+            "Market Cap": mcap_read,
+            "Market Cap Raw": mcap
+        })
+
+    # Convert to DataFrame
+    df_company = pd.DataFrame(company_data)
+    universe = list_name or "custom"
+
+    # Parquet needs one type per column; "Error"/"N/A" become nulls there
+    df_parquet = df_company.assign(**{"Market Cap Raw": pd.to_numeric(df_company["Market Cap Raw"], errors="coerce")})
+    with profiling.stage("info.write"):
+        write_partition(df_parquet, "stock_info", universe, key="stock_info")
+    print(f"✅ Company, Ticker, Sector, and Market Cap saved to the stock_info dataset ({universe})")
+
+    if save_csv:
+        filepath = export_csv(df_company, f"{universe}_stock_info.csv")
+        print(f"✅ CSV copy saved to {filepath}")
@@ -0,0 +1,103 @@
+"""
+Columnar Parquet storage for the ./data outputs.
+
+Each dataset lives under ./data/parquet/<dataset>/ and is hive-partitioned by
+universe and year, e.g. stock_info/universe=sti/year=2026/. Snapshot datasets
+(no year column) keep only the latest snapshot of each key. Reads go through
+one memory-mapped dataset scan with optional column projection and partition
+filters, so thousands of per-symbol writes load as fast as one file.
+"""
+import glob
+import os
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+DATA_DIR = "./data"
+PARQUET_DIR = os.path.join(DATA_DIR, "parquet")
+PARTITIONING = ds.partitioning(
+    pa.schema([("universe", pa.string()), ("year", pa.int32())]), flavor="hive"
+)
+
+_local_fs = fs.LocalFileSystem(use_mmap=True)
+
+
+def dataset_path(dataset, root=PARQUET_DIR):
+    return os.path.join(root, dataset)
+
+
+def write_partition(df, dataset, universe, key, year_col=None, root=PARQUET_DIR):
+    """
+    Write a frame into a dataset, replacing only the files previously written for `key`.
+
+    Args:
+        df (DataFrame): rows to store
+        dataset (str): dataset name, e.g. "stock_info"
+        universe (str): universe partition, e.g. "kompas100" or "sti"
+        key (str): file name stem inside each partition, e.g. a symbol;
+            writing the same key again overwrites its files
+        year_col (str, optional): column holding the year partition; defaults
+            to the current year for snapshot datasets, whose files for `key`
+            in earlier years are removed, so reruns do not pile up snapshots
+        root (str): parquet root folder
+    """
+    df = df.copy()
+    df["universe"] = universe
+    stem = key.replace('.', '_')
+    if year_col is None:
+        df["year"] = datetime.now().year
+        pattern = os.path.join(dataset_path(dataset, root), f"universe={universe}", "year=*", f"{stem}-*.parquet")
+        for old_path in glob.glob(pattern):
+            os.remove(old_path)
+    else:
+        df["year"] = df[year_col].astype("int32")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    ds.write_dataset(
+        table,
+        dataset_path(dataset, root),
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"{stem}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        filesystem=_local_fs,
+    )
+
+
+def read_dataset(dataset, columns=None, universe=None, year=None, root=PARQUET_DIR):
+    """
+    Load a dataset as a DataFrame in one memory-mapped scan.
+
+    Args:
+        dataset (str): dataset name, e.g. "stock_info"
+        columns (list, optional): columns to read; all columns when None
+        universe (str or list, optional): keep only these universe partitions
+        year (int or list, optional): keep only these year partitions
+        root (str): parquet root folder
+
+    Returns:
+        DataFrame, or None if the dataset has never been written.
+    """
+    path = dataset_path(dataset, root)
+    if not os.path.isdir(path):
+        return None
+    dataset_ = ds.dataset(path, format="parquet", partitioning=PARTITIONING, filesystem=_local_fs)
+
+    expression = None
+    for field, value in (("universe", universe), ("year", year)):
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        condition = ds.field(field).isin(list(values))
+        expression = condition if expression is None else expression & condition
+
+    return dataset_.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def export_csv(df, filename, data_dir=DATA_DIR):
+    """Optional CSV copy next to the Parquet dataset; returns the written path."""
+    os.makedirs(data_dir, exist_ok=True)
+    filepath = os.path.join(data_dir, filename)
+    df.to_csv(filepath, index=False)
+    return filepath
@@ -0,0 +1,104 @@
+"""
+Named, versioned universes, with helpers to fetch overlapping ones together.
+
+Every universe is stored as {display name: ticker}; plain ticker lists and
+sets use the ticker as the name. Registering a changed constituent list adds a
+new version instead of overwriting the old one, so past runs stay reproducible.
+The built-in universes from stock_div.universes are registered on load.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+from stock_div import universes
+
+REGISTRY_FILE = "./data/universes.json"
+BUILTIN = ("stocks", "sg", "best_div", "kompas100", "sti")
+
+_file_lock = threading.Lock()
+
+
+def _members(constituents):
+    if isinstance(constituents, dict):
+        return dict(constituents)
+    # Sets have no order; sort so the same set always compares equal across runs
+    tickers = sorted(constituents) if isinstance(constituents, (set, frozenset)) else list(constituents)
+    return {ticker: ticker for ticker in tickers}
+
+
+class UniverseRegistry:
+    """
+    Persisted as JSON: {name: [{"version": 1, "created_at": iso timestamp, "members": {...}}, ...]}.
+    """
+
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        self.universes = self._read()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def register(self, name, constituents):
+        """Adds a version when the constituents differ from the latest one. Returns the current version."""
+        members = _members(constituents)
+        versions = self.universes.setdefault(name, [])
+        if versions and versions[-1]["members"] == members:
+            return versions[-1]["version"]
+        version = versions[-1]["version"] + 1 if versions else 1
+        versions.append({"version": version, "created_at": datetime.now().isoformat(), "members": members})
+        return version
+
+    def names(self):
+        return list(self.universes)
+
+    def versions(self, name):
+        return [entry["version"] for entry in self.universes[name]]
+
+    def get(self, name, version=None):
+        """{display name: ticker} for a universe, the latest version unless one is given."""
+        versions = self.universes.get(name)
+        if not versions:
+            raise KeyError(f"Unknown universe: {name}")
+        if version is None:
+            return dict(versions[-1]["members"])
+        for entry in versions:
+            if entry["version"] == version:
+                return dict(entry["members"])
+        raise KeyError(f"Unknown version {version} of universe {name}")
+
+    def symbols(self, *names):
+        """Distinct tickers across the given universes, in first-seen order."""
+        seen = {}
+        for name in names:
+            seen.update(dict.fromkeys(self.get(name).values()))
+        return list(seen)
+
+    def fan_out(self, results, names):
+        """Splits {ticker: result} from one combined fetch into {universe: {ticker: result}}."""
+        return {name: {ticker: results[ticker] for ticker in self.get(name).values() if ticker in results} for name in names}
+
+    def save(self):
+        with _file_lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.universes, f, indent=1)
+            os.replace(tmp_path, self.path)
+
+
+def load_registry(path=REGISTRY_FILE):
+    """The registry on disk, with the built-in universes registered (and saved if any changed)."""
+    registry = UniverseRegistry(path)
+    before = {name: registry.versions(name) for name in registry.names()}
+    for name in BUILTIN:
+        registry.register(name, getattr(universes, name))
+    if before != {name: registry.versions(name) for name in registry.names()}:
+        registry.save()
+    return registry
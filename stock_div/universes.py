@@ -0,0 +1,116 @@
+"""
+Stock universes shared by the notebooks and the headless CLI.
+
+`stocks`, `sg` and `best_div` map a display name to a Yahoo ticker;
+`kompas100` and `sti` are the full index constituent lists.
+"""
+
+# Chart and report prefix per kompas100 universe
+MARKETS = {"stocks": "IDX", "sg": "SG"}
+
+
+def market_label(universe_name):
+    """MARKETS prefix for a universe; other registered universes use their upper-cased name."""
+    return MARKETS.get(universe_name, universe_name.upper())
+
+# Singapore large caps, keyed by display name
+sg = {
+    # Financials (Banks & Exchange)
+    "DBS": "D05.SI", "OCBC": "O39.SI", "UOB": "U11.SI",
+    "SGX": "S68.SI",
+
+    # Real Estate & REITs
+    "CapitaLand Investment": "9CI.SI", "CICT": "C38.SI", "Ascendas REIT": "A17U.SI",
+    "City Developments": "C09.SI", "Hongkong Land": "H78.SI", "UOL Group": "U14.SI",
+    "Mapletree Pan Asia Com Tr": "N2IU.SI", "Mapletree Industrial Trust": "ME8U.SI",
+    "Mapletree Logistics Trust": "M44U.SI", "Frasers Centrepoint Trust": "J69U.SI",
+    "Frasers Logistics & Com Tr": "BUOU.SI", "Keppel REIT": "K71U.SI",
+    "Keppel DC REIT": "AJBU.SI",
+
+    # Industrials, Conglomerates & Transport
+    "Jardine Matheson": "J36.SI", "Jardine C&C": "C07.SI", "Keppel Ltd": "BN4.SI",
+    "ST Engineering": "S63.SI", "SATS": "S58.SI", "SIA": "C6L.SI",
+    "Yangzijiang Shipbuilding": "BS6.SI", "Seatrium": "5E2.SI",
+
+    # Communications & Technology
+    "Singtel": "Z74.SI", "Venture Corp": "V03.SI",
+
+    # Consumer & Healthcare
+    "Thai Beverage": "Y92.SI", "Genting Singapore": "G13.SI", "DFI Retail Group": "D01.SI",
+    "Wilmar International": "F34.SI", "Emperador": "EMI.SI",
+
+    # Utilities & Energy
+    "Sembcorp Industries": "U96.SI",
+}
+
+# Kompas100 subset, keyed by IDX code
+stocks = {
+    # Financials (The Big 4 + Banks)
+    "BBCA": "BBCA.JK", "BBRI": "BBRI.JK", "BMRI": "BMRI.JK", "BBNI": "BBNI.JK",
+    "BBTN": "BBTN.JK", "BRIS": "BRIS.JK", "BDMN": "BDMN.JK", "ARTO": "ARTO.JK",
+    "BJBR": "BJBR.JK", "BJTM": "BJTM.JK", "BBYB": "BBYB.JK", "PNLF": "PNLF.JK",
+
+    # Energy & Mining (The Heavyweights)
+    "ADRO": "ADRO.JK", "ITMG": "ITMG.JK", "PTBA": "PTBA.JK", "ANTM": "ANTM.JK",
+    "INCO": "INCO.JK", "MEDC": "MEDC.JK", "HRUM": "HRUM.JK", "AKRA": "AKRA.JK",
+    "AMMN": "AMMN.JK", "BREN": "BREN.JK", "CUAN": "CUAN.JK", "PGEO": "PGEO.JK",
+    "MBMA": "MBMA.JK", "NCKL": "NCKL.JK", "ELSA": "ELSA.JK", "ENRG": "ENRG.JK",
+    "TOBA": "TOBA.JK", "SGER": "SGER.JK", "AADI": "AADI.JK",
+
+    # Consumer & Retail
+    "UNVR": "UNVR.JK", "ICBP": "ICBP.JK", "INDF": "INDF.JK", "AMRT": "AMRT.JK",
+    "ACES": "ACES.JK", "MYOR": "MYOR.JK", "SIDO": "SIDO.JK", "HMSP": "HMSP.JK",
+    "CPIN": "CPIN.JK", "JPFA": "JPFA.JK", "ERAA": "ERAA.JK", "MAPI": "MAPI.JK",
+    "MAPA": "MAPA.JK", "CMRY": "CMRY.JK",
+
+    # Infrastructure, Tech & Telco
+    "TLKM": "TLKM.JK", "ISAT": "ISAT.JK", "EXCL": "EXCL.JK", "MTEL": "MTEL.JK",
+    "TOWR": "TOWR.JK", "JSMR": "JSMR.JK", "GOTO": "GOTO.JK", "BUKA": "BUKA.JK",
+    "EMTK": "EMTK.JK", "SCMA": "SCMA.JK", "WIFI": "WIFI.JK", "INET": "INET.JK",
+
+    # Basic Materials & Industrials
+    "ASII": "ASII.JK", "UNTR": "UNTR.JK", "SMGR": "SMGR.JK", "INTP": "INTP.JK",
+    "TPIA": "TPIA.JK", "BRPT": "BRPT.JK", "INKP": "INKP.JK", "DSSA": "DSSA.JK",
+    "IMPC": "IMPC.JK", "ESSA": "ESSA.JK", "FILM": "FILM.JK",
+
+    # Property & Healthcare
+    "BSDE": "BSDE.JK", "PWON": "PWON.JK", "CTRA": "CTRA.JK", "SMRA": "SMRA.JK",
+    "PANI": "PANI.JK", "HEAL": "HEAL.JK", "MIKA": "MIKA.JK", "KLBF": "KLBF.JK"
+}
+
+best_div = {
+    # Financials (Banks)
+    "BBRI": "BBRI.JK", "BJBR": "BJBR.JK", "BJTM": "BJTM.JK",
+
+    # Energy & Mining (Coal & Heavy Equipment)
+    "ADRO": "ADRO.JK", "ITMG": "ITMG.JK", "PTBA": "PTBA.JK",
+    "UNTR": "UNTR.JK", "AADI": "AADI.JK",
+
+    # Consumer Non-Cyclicals (Tobacco & Staples)
+    "HMSP": "HMSP.JK", "UNVR": "UNVR.JK",
+
+    # Basic Materials (Cement)
+    "INTP": "INTP.JK", "SMGR": "SMGR.JK",
+
+    # Consumer Cyclicals & Trading (Retail & Distribution)
+    "ACES": "ACES.JK", "AKRA": "AKRA.JK",
+}
+
+kompas100 = [
+    "BBCA.JK", "DSSA.JK", "BBRI.JK", "TPIA.JK", "AMMN.JK", "BMRI.JK", "TLKM.JK", "ASII.JK", "BRPT.JK", "PANI.JK",
+    "BBNI.JK", "FILM.JK", "BRMS.JK", "BRIS.JK", "ANTM.JK", "BUMI.JK", "HMSP.JK", "UNTR.JK", "ICBP.JK", "NCKL.JK",
+    "ADMR.JK", "MDKA.JK", "MBMA.JK", "UNVR.JK", "CPIN.JK", "AMRT.JK", "ISAT.JK", "PTRO.JK", "INCO.JK", "GOTO.JK",
+    "ADRO.JK", "EXCL.JK", "INDF.JK", "AADI.JK", "EMTK.JK", "KLBF.JK", "MYOR.JK", "TCPI.JK", "PGAS.JK", "INKP.JK",
+    "PGEO.JK", "MTEL.JK", "BNGA.JK", "CMRY.JK", "MEDC.JK", "ENRG.JK", "MIKA.JK", "NISP.JK", "JPFA.JK", "TOWR.JK",
+    "GGRM.JK", "TAPG.JK", "PTBA.JK", "AVIA.JK", "PNBN.JK", "JSMR.JK", "AKRA.JK", "ITMG.JK", "TINS.JK", "SRTG.JK",
+    "ARTO.JK", "INTP.JK", "TKIM.JK", "HEAL.JK", "MAPA.JK", "MAPI.JK", "BSDE.JK", "KPIG.JK", "RAJA.JK", "PWON.JK",
+    "BBTN.JK", "INDY.JK", "SMGR.JK", "SCMA.JK", "SIDO.JK", "CTRA.JK", "BUKA.JK", "DSNG.JK", "HRUM.JK", "STAA.JK",
+    "AUTO.JK", "DEWA.JK", "ESSA.JK", "BFIN.JK", "CLEO.JK", "BTPS.JK", "PNLF.JK", "LSIP.JK", "SSIA.JK", "ACES.JK",
+    "SMRA.JK", "ERAA.JK", "SMDR.JK", "MNCN.JK", "ELSA.JK", "BBYB.JK", "KIJA.JK", "GJTL.JK", "ASRI.JK", "PTPP.JK"
+]
+
+sti = {
+    "H78.SI", "S63.SI", "G13.SI", "Y92.SI", "BUOU.SI", "AJBU.SI", "N2IU.SI", "9CI.SI", "ME8U.SI", "BS6.SI",
+    "5E2.SI", "O39.SI", "J36.SI", "U14.SI", "U96.SI", "D01.SI", "D05.SI", "Z74.SI", "BN4.SI", "J69U.SI",
+    "M44U.SI", "F34.SI", "S58.SI", "C09.SI", "C38U.SI", "V03.SI", "A17U.SI", "U11.SI", "S68.SI", "C6L.SI"
+}
@@ -23,16 +23,16 @@ def _(mo):
 
 
 @app.cell
-def _(fetch_and_save_stock_info, kompas100, run_button, selected, sti):
+def _(fetch_and_save_universes, run_button, selected):
 
     if run_button.value:
         if selected.value == "Kompas 100":
-            fetch_and_save_stock_info(kompas100, "kompas100")
+            fetch_and_save_universes(["kompas100"])
         elif selected.value == "STI":
-            fetch_and_save_stock_info(sti, "sti")
+            fetch_and_save_universes(["sti"])
         elif selected.value == "Both":
-            fetch_and_save_stock_info(kompas100, "kompas100")
-            fetch_and_save_stock_info(sti, "sti")
+            # One fetch per distinct ticker, fanned out to both lists
+            fetch_and_save_universes(["kompas100", "sti"])
 
         else:
             print("No valid option selected.")
@@ -42,115 +42,16 @@ def _(fetch_and_save_stock_info, kompas100, run_button, selected, sti):
 @app.cell(hide_code=True)
 def _():
     import marimo as mo
-    import pandas as pd
     import yfinance as yf
-    from datetime import datetime
-    import io
-    from tqdm import tqdm
-    import os
-    return mo, os, pd, tqdm, yf
-
-
-@app.cell(hide_code=True)
-def _():
-    kompas100 = [
-        "BBCA.JK", "DSSA.JK", "BBRI.JK", "TPIA.JK", "AMMN.JK", "BMRI.JK", "TLKM.JK", "ASII.JK", "BRPT.JK", "PANI.JK",
-        "BBNI.JK", "FILM.JK", "BRMS.JK", "BRIS.JK", "ANTM.JK", "BUMI.JK", "HMSP.JK", "UNTR.JK", "ICBP.JK", "NCKL.JK",
-        "ADMR.JK", "MDKA.JK", "MBMA.JK", "UNVR.JK", "CPIN.JK", "AMRT.JK", "ISAT.JK", "PTRO.JK", "INCO.JK", "GOTO.JK",
-        "ADRO.JK", "EXCL.JK", "INDF.JK", "AADI.JK", "EMTK.JK", "KLBF.JK", "MYOR.JK", "TCPI.JK", "PGAS.JK", "INKP.JK",
-        "PGEO.JK", "MTEL.JK", "BNGA.JK", "CMRY.JK", "MEDC.JK", "ENRG.JK", "MIKA.JK", "NISP.JK", "JPFA.JK", "TOWR.JK",
-        "GGRM.JK", "TAPG.JK", "PTBA.JK", "AVIA.JK", "PNBN.JK", "JSMR.JK", "AKRA.JK", "ITMG.JK", "TINS.JK", "SRTG.JK",
-        "ARTO.JK", "INTP.JK", "TKIM.JK", "HEAL.JK", "MAPA.JK", "MAPI.JK", "BSDE.JK", "KPIG.JK", "RAJA.JK", "PWON.JK",
-        "BBTN.JK", "INDY.JK", "SMGR.JK", "SCMA.JK", "SIDO.JK", "CTRA.JK", "BUKA.JK", "DSNG.JK", "HRUM.JK", "STAA.JK",
-        "AUTO.JK", "DEWA.JK", "ESSA.JK", "BFIN.JK", "CLEO.JK", "BTPS.JK", "PNLF.JK", "LSIP.JK", "SSIA.JK", "ACES.JK",
-        "SMRA.JK", "ERAA.JK", "SMDR.JK", "MNCN.JK", "ELSA.JK", "BBYB.JK", "KIJA.JK", "GJTL.JK", "ASRI.JK", "PTPP.JK"
-    ]
-
-    sti = {
-        "H78.SI", "S63.SI", "G13.SI", "Y92.SI", "BUOU.SI", "AJBU.SI", "N2IU.SI", "9CI.SI", "ME8U.SI", "BS6.SI",
-        "5E2.SI", "O39.SI", "J36.SI", "U14.SI", "U96.SI", "D01.SI", "D05.SI", "Z74.SI", "BN4.SI", "J69U.SI",
-        "M44U.SI", "F34.SI", "S58.SI", "C09.SI", "C38U.SI", "V03.SI", "A17U.SI", "U11.SI", "S68.SI", "C6L.SI"
-    }
-    return kompas100, sti
+    import pprint
+    from stock_div.storage import read_dataset
+    return mo, pprint, read_dataset, yf
 
 
 @app.cell
-def _(os, pd, tqdm, yf):
-    # Helper: convert large numbers to human-readable
-    def human_readable_number(num):
-        try:
-            num = float(num)
-        except (TypeError, ValueError):
-            return "N/A"
-        if num >= 1_000_000_000_000:
-            return f"{num/1_000_000_000_000:.1f}T"
-        elif num >= 1_000_000_000:
-            return f"{num/1_000_000_000:.1f}B"
-        elif num >= 1_000_000:
-            return f"{num/1_000_000:.1f}M"
-        elif num >= 1_000:
-            return f"{num/1_000:.1f}K"
-        else:
-            return str(num)
-
-    def fetch_and_save_stock_info(ticker_list, list_name=None):
-        """
-        Fetch stock info from Yahoo Finance and save to CSV.
-
-        Args:
-            ticker_list (list or set): list of tickers
-            list_name (str, optional): name to use for CSV file. If None, defaults to 'custom'
-        """
-        all_tickers = list(ticker_list)  # in case it's a set
-        tickers = yf.Tickers(all_tickers)
-
-        company_data = []
-
-        for ticker_symbol in tqdm(all_tickers, desc="Fetching tickers"):
-            t = tickers.tickers.get(ticker_symbol)
-            if t is None:
-                company_data.append({
-                    "Company": "Error",
-                    "Ticker": ticker_symbol,
-                    "Sector": "Error",
-                    "Market Cap": "Error",
-                    "Market Cap Raw": "Error"
-                })
-                continue
-
-            info = t.info if hasattr(t, "info") else {}
-            name = info.get("shortName", "N/A")
-            sector = info.get("sector", "N/A")
-            mcap = info.get("marketCap", "N/A")
-            mcap_read = human_readable_number(mcap)
-
-            company_data.append({
-                "Company": name,
-                "Ticker": ticker_symbol,
-                "Sector": sector,
-                "Market Cap": mcap_read,
-                "Market Cap Raw": mcap
-            })
-
-        # Convert to DataFrame
-        df_company = pd.DataFrame(company_data)
-
-
-
-        # Determine filename
-        if list_name is None:
-            filename = "custom_stock_info.csv"
-        else:
-            filename = f"{list_name}_stock_info.csv"
-
-        os.makedirs("./data", exist_ok=True)
-
-
-        # Save CSV to /data folder
-        filepath = f"./data/{filename}"
-        df_company.to_csv(filepath, index=False)
-        print(f"✅ Company, Ticker, Sector, and Market Cap saved to {filepath}")
-    return (fetch_and_save_stock_info,)
+def _():
+    from stock_div.stock_info import fetch_and_save_universes
+    return (fetch_and_save_universes,)
 
 
 @app.cell
@@ -162,23 +63,27 @@ def _(mo):
 
 
 @app.cell
-def _(mo, os, pd, show_button):
+def _(mo, read_dataset, show_button):
 
     _tables = []
 
-    if os.path.exists("./data/kompas100_stock_info.csv"):
-        pd_kompas100 = pd.read_csv("./data/kompas100_stock_info.csv")
-        _tables.append(mo.md("# Kompas 100"))
-        _tables.append(mo.ui.table(pd_kompas100))
-    else:
-        _tables.append(mo.md("⚠️ kompas100_stock_info.csv not found."))
-
-    if os.path.exists("./data/sti_stock_info.csv"):
-        pd_sti = pd.read_csv("./data/sti_stock_info.csv")
-        _tables.append(mo.md("# STI"))
-        _tables.append(mo.ui.table(pd_sti))
-    else:
-        _tables.append(mo.md("⚠️ sti_stock_info.csv not found."))
+    # One dataset scan for both universes, only the columns the tables show
+    _info = None
+    if show_button.value:
+        _info = read_dataset(
+            "stock_info",
+            columns=["Company", "Ticker", "Sector", "Market Cap", "Market Cap Raw", "universe", "year"],
+            universe=["kompas100", "sti"],
+        )
+
+    for _universe, _title in [("kompas100", "Kompas 100"), ("sti", "STI")]:
+        _rows = None if _info is None else _info[_info["universe"] == _universe]
+        if _rows is not None and not _rows.empty:
+            _latest = _rows[_rows["year"] == _rows["year"].max()].drop(columns=["universe", "year"])
+            _tables.append(mo.md(f"# {_title}"))
+            _tables.append(mo.ui.table(_latest.reset_index(drop=True)))
+        else:
+            _tables.append(mo.md(f"⚠️ {_universe} stock_info dataset not found."))
 
 
     # Stack and show tables only if there’s at least one